@@ -1,9 +1,23 @@
 """AI agents for pre-labeling tasks using CrewAI."""
 
-from alo.agents.base_agent import BaseALOAgent
-from alo.agents.sampler_agent import IntelligentSamplerAgent
-from alo.agents.discovery_agent import ObjectDiscoveryAgent
-from alo.agents.validator_agent import LLMValidatorAgent, EnsembleValidatorAgent
+import importlib
+from typing import TYPE_CHECKING, Any, List
+
+if TYPE_CHECKING:
+    from alo.agents.base_agent import BaseALOAgent
+    from alo.agents.sampler_agent import IntelligentSamplerAgent
+    from alo.agents.discovery_agent import ObjectDiscoveryAgent
+    from alo.agents.validator_agent import LLMValidatorAgent, EnsembleValidatorAgent
+
+# Agents are imported on first access (PEP 562), so importing alo does not
+# pay for CrewAI, LangChain and friends until an agent is actually used
+_LAZY_IMPORTS = {
+    "BaseALOAgent": "alo.agents.base_agent",
+    "IntelligentSamplerAgent": "alo.agents.sampler_agent",
+    "ObjectDiscoveryAgent": "alo.agents.discovery_agent",
+    "LLMValidatorAgent": "alo.agents.validator_agent",
+    "EnsembleValidatorAgent": "alo.agents.validator_agent",
+}
 
 __all__ = [
     "BaseALOAgent",
@@ -12,3 +26,16 @@ __all__ = [
     "LLMValidatorAgent",
     "EnsembleValidatorAgent",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _LAZY_IMPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    value = getattr(importlib.import_module(_LAZY_IMPORTS[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
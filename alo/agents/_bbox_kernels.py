@@ -0,0 +1,126 @@
+"""
+Bounding box kernels used by the validation agents.
+
+Boxes are passed as an (N, 4) array in [x, y, width, height] format. When
+numba is installed, large inputs are handled by a parallel JIT-compiled
+kernel that never materializes the N x N comparison matrix.
+"""
+
+import logging
+import threading
+from typing import Optional
+import numpy as np
+
+try:
+    import numba
+    from numba import njit, prange
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+logger = logging.getLogger(__name__)
+
+# numba.config attributes are created at runtime, hence getattr/setattr
+if HAS_NUMBA and getattr(numba.config, 'THREADING_LAYER', None) == 'default':
+    # numba prefers TBB, whose worker pool can hang at interpreter exit when
+    # it is first started from a thread other than the main thread. OpenMP
+    # is thread-safe and can be started from any thread; an explicit
+    # NUMBA_THREADING_LAYER setting is left alone.
+    setattr(numba.config, 'THREADING_LAYER', 'omp')
+
+# Inputs above this size use the numba kernel when it is available
+NUMBA_MIN_BOXES = 2000
+
+# Upper bound on elements per temporary comparison matrix in the NumPy path
+_BLOCK_ELEMENTS = 1 << 22
+
+
+def _overlap_counts_numpy(x1, y1, x2, y2) -> np.ndarray:
+    n = len(x1)
+    counts = np.empty(n, dtype=np.int64)
+    
+    # Compare blocks of rows against all boxes to bound memory at O(block * N)
+    block = max(1, _BLOCK_ELEMENTS // max(n, 1))
+    for start in range(0, n, block):
+        stop = min(start + block, n)
+        rows = slice(start, stop)
+        overlap = (
+            (x1[rows, None] <= x2[None, :])
+            & (x2[rows, None] >= x1[None, :])
+            & (y1[rows, None] <= y2[None, :])
+            & (y2[rows, None] >= y1[None, :])
+        )
+        # A box never counts as overlapping itself
+        overlap[np.arange(stop - start), np.arange(start, stop)] = False
+        counts[rows] = overlap.sum(axis=1)
+    
+    return counts
+
+
+if HAS_NUMBA:
+    @njit(parallel=True, cache=True)
+    def _overlap_counts_numba(x1, y1, x2, y2, out):
+        n = x1.shape[0]
+        for i in prange(n):
+            c = 0
+            for j in range(n):
+                if (i != j and x1[i] <= x2[j] and x2[i] >= x1[j]
+                        and y1[i] <= y2[j] and y2[i] >= y1[j]):
+                    c += 1
+            out[i] = c
+    
+    def _warm_up():
+        warmup = np.zeros(2, dtype=np.float64)
+        _overlap_counts_numba(warmup, warmup, warmup, warmup, np.zeros(2, dtype=np.int64))
+
+
+# None until the kernel has been tried once
+_numba_ready: Optional[bool] = None
+_numba_lock = threading.Lock()
+
+
+def _numba_available() -> bool:
+    global _numba_ready
+    if not HAS_NUMBA:
+        return False
+    if _numba_ready is None:
+        with _numba_lock:
+            if _numba_ready is None:
+                try:
+                    # Compile (or load from the on-disk cache) up front, not on the first call
+                    _warm_up()
+                    _numba_ready = True
+                except Exception as e:
+                    # e.g. no usable threading layer on this platform
+                    logger.warning(f"numba kernel unavailable, using NumPy instead: {str(e)}")
+                    _numba_ready = False
+    return _numba_ready
+
+
+_numba_available()
+
+
+def overlap_counts(boxes: np.ndarray) -> np.ndarray:
+    """
+    Count, for every box, how many other boxes it overlaps.
+    
+    Boxes that merely touch count as overlapping.
+    
+    Args:
+        boxes: Array of shape (N, 4) in [x, y, width, height] format
+        
+    Returns:
+        Integer array of shape (N,) with overlap counts
+    """
+    boxes = np.ascontiguousarray(boxes, dtype=np.float64)
+    x1 = np.ascontiguousarray(boxes[:, 0])
+    y1 = np.ascontiguousarray(boxes[:, 1])
+    x2 = x1 + boxes[:, 2]
+    y2 = y1 + boxes[:, 3]
+    
+    if len(boxes) > NUMBA_MIN_BOXES and _numba_available():
+        counts = np.empty(len(boxes), dtype=np.int64)
+        _overlap_counts_numba(x1, y1, x2, y2, counts)
+        return counts
+    
+    return _overlap_counts_numpy(x1, y1, x2, y2)
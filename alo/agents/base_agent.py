@@ -2,14 +2,54 @@
 Base Agent class using CrewAI for modular, intelligent agents.
 """
 
+import asyncio
+import functools
+import inspect
 import logging
-from typing import Dict, List, Any, Optional
+from typing import Callable, Dict, List, Any, Optional
 from abc import ABC, abstractmethod
 from crewai import Agent, Task, Crew
 from langchain_openai import ChatOpenAI
+from pydantic import SecretStr
 
 logger = logging.getLogger(__name__)
 
+# Model used for each provider when the agent config does not name one
+_DEFAULT_MODELS = {
+    'openai': 'gpt-4-turbo-preview',
+    'anthropic': 'claude-3-5-sonnet-20241022',
+}
+
+
+@functools.lru_cache(maxsize=32)
+def _get_llm(
+    model_provider: str,
+    model: str,
+    temperature: float,
+    api_key: Optional[str]
+) -> Any:
+    """
+    Create a chat model client, shared by all agents with the same settings.
+    
+    Reusing one client per (provider, model, temperature, key) lets agents
+    share its HTTP connection pool instead of each opening their own.
+    """
+    if model_provider == 'openai':
+        return ChatOpenAI(
+            model=model,
+            temperature=temperature,
+            api_key=SecretStr(api_key) if api_key is not None else None
+        )
+    elif model_provider == 'anthropic':
+        # Add Anthropic support
+        from langchain_anthropic import ChatAnthropic
+        return ChatAnthropic(
+            model=model,
+            temperature=temperature,
+            api_key=api_key
+        )
+    raise ValueError(f"Unsupported model provider: {model_provider}")
+
 
 class BaseALOAgent(ABC):
     """
@@ -55,22 +95,21 @@ class BaseALOAgent(ABC):
         """Initialize the language model for the agent."""
         model_provider = self.config.get('model_provider', 'openai')
         
-        if model_provider == 'openai':
-            return ChatOpenAI(
-                model=self.config.get('model', 'gpt-4-turbo-preview'),
-                temperature=self.config.get('temperature', 0.7),
-                api_key=self.config.get('api_key')
-            )
-        elif model_provider == 'anthropic':
-            # Add Anthropic support
-            from langchain_anthropic import ChatAnthropic
-            return ChatAnthropic(
-                model=self.config.get('model', 'claude-3-5-sonnet-20241022'),
-                temperature=self.config.get('temperature', 0.7),
-                api_key=self.config.get('api_key')
-            )
-        else:
+        if model_provider not in _DEFAULT_MODELS:
             return None
+        
+        return _get_llm(
+            model_provider,
+            self._model_name(),
+            self.config.get('temperature', 0.7),
+            self.config.get('api_key')
+        )
+    
+    def _model_name(self) -> str:
+        """Model configured for this agent, or its provider's default."""
+        model_provider = self.config.get('model_provider', 'openai')
+        model: str = self.config.get('model', _DEFAULT_MODELS.get(model_provider, ''))
+        return model
     
     @abstractmethod
     def execute(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
@@ -85,6 +124,74 @@ class BaseALOAgent(ABC):
         """
         pass
     
+    async def execute_async(self, inputs: Dict[str, Any], ctx: Any = None) -> Dict[str, Any]:
+        """
+        Execute the agent's task without blocking the event loop.
+        
+        The default runs :meth:`execute` in a worker thread so agents can be
+        pipelined by the orchestrator; agents with native async I/O override
+        this.
+        
+        Args:
+            inputs: Input data for the agent
+            ctx: Workflow run context, passed on if :meth:`execute` accepts it
+            
+        Returns:
+            Dictionary with agent's outputs
+        """
+        execute: Callable[..., Dict[str, Any]] = self.execute
+        if ctx is not None and 'ctx' in inspect.signature(execute).parameters:
+            execute = functools.partial(execute, ctx=ctx)
+        
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, execute, inputs)
+    
+    def quick_call(self, system: Optional[str], user: Any) -> str:
+        """
+        Send a single prompt straight to the model, bypassing CrewAI.
+        
+        Use this for one-shot leaf calls; CrewAI's Task/Crew scaffolding
+        only pays off for real multi-step or multi-agent work.
+        
+        Args:
+            system: System instructions, or None to use the agent's persona
+            user: User message content, either text or a list of content parts
+            
+        Returns:
+            The model's response text
+        """
+        response = self._require_llm().invoke(self._quick_messages(system, user))
+        return str(response.content)
+    
+    async def aquick_call(self, system: Optional[str], user: Any) -> str:
+        """
+        Async variant of quick_call.
+        
+        Args:
+            system: System instructions, or None to use the agent's persona
+            user: User message content, either text or a list of content parts
+            
+        Returns:
+            The model's response text
+        """
+        response = await self._require_llm().ainvoke(self._quick_messages(system, user))
+        return str(response.content)
+    
+    def _require_llm(self) -> Any:
+        if self.llm is None:
+            raise RuntimeError(f"{self.name} requires a configured language model")
+        return self.llm
+    
+    def _quick_messages(self, system: Optional[str], user: Any) -> List[Any]:
+        from langchain_core.messages import HumanMessage, SystemMessage
+        
+        if system is None:
+            system = self._persona_prompt()
+        return [SystemMessage(content=system), HumanMessage(content=user)]
+    
+    def _persona_prompt(self) -> str:
+        return f"You are {self.role}. {self.backstory}\nYour goal: {self.goal}"
+    
     def create_task(self, description: str, expected_output: str) -> Task:
         """
         Create a CrewAI task for this agent.
@@ -112,11 +219,25 @@ class BaseALOAgent(ABC):
         Returns:
             Crew execution results
         """
-        crew = Crew(
+        result = self._new_crew(tasks).kickoff()
+        return {"status": "completed", "result": result}
+    
+    async def run_crew_async(self, tasks: List[Task]) -> Dict[str, Any]:
+        """
+        Run a crew with this agent and given tasks without blocking the event loop.
+        
+        Args:
+            tasks: List of tasks to execute
+            
+        Returns:
+            Crew execution results
+        """
+        result = await self._new_crew(tasks).kickoff_async()
+        return {"status": "completed", "result": result}
+    
+    def _new_crew(self, tasks: List[Task]) -> Crew:
+        return Crew(
             agents=[self.crew_agent],
             tasks=tasks,
             verbose=self.config.get('verbose', False)
         )
-        
-        result = crew.kickoff()
-        return {"status": "completed", "result": result}
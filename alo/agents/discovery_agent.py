@@ -5,15 +5,57 @@ This agent automatically discovers object classes in a dataset
 by analyzing sample images with foundation models.
 """
 
+import asyncio
 import logging
 import base64
-from typing import Dict, List, Any
-from collections import Counter
+import hashlib
+import json
+import mimetypes
+import os
+import re
+import tempfile
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Set, Tuple
+import numpy as np
 from .base_agent import BaseALOAgent
-from crewai import Task
+from alo.utils.cache import ResultCache
+
+try:
+    import aiofiles
+except ImportError:
+    aiofiles = None
 
 logger = logging.getLogger(__name__)
 
+# Ratio of newly seen to all seen classes below which the class vocabulary
+# is considered stable enough to start consolidating
+_NEW_CLASS_RATE = 0.1
+
+# Enumerations models sometimes prepend to per-image lines ("1.", "Image 2:")
+_LINE_PREFIX = re.compile(r'^\s*(?:image\s*)?\d+\s*[:.)-]\s*', re.IGNORECASE)
+
+# OpenAI Batch API limits per input file
+_BATCH_FILE_MAX_BYTES = 200 * 1024 * 1024
+_BATCH_FILE_MAX_REQUESTS = 50000
+
+# Image analysis results keyed by content hash, shared by all discovery agents
+# and persisted under the ALO cache directory
+_RESULT_CACHE = ResultCache('discovery', maxsize=4096)
+
+# Leading bytes of an image that are hashed, with its size, into its cache key
+_CACHE_KEY_BYTES = 64 * 1024
+
+
+def _read_file(path: str) -> bytes:
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def _read_head(path: str) -> Tuple[bytes, int]:
+    with open(path, 'rb') as f:
+        return f.read(_CACHE_KEY_BYTES), os.fstat(f.fileno()).st_size
+
 
 class ObjectDiscoveryAgent(BaseALOAgent):
     """
@@ -43,6 +85,25 @@ class ObjectDiscoveryAgent(BaseALOAgent):
         """
         Discover object classes from sampled images.
         
+        Synchronous wrapper around :meth:`execute_async`.
+        """
+        return asyncio.run(self.execute_async(inputs))
+    
+    async def execute_async(self, inputs: Dict[str, Any], ctx: Any = None) -> Dict[str, Any]:
+        """
+        Discover object classes from sampled images.
+        
+        Images are packed ``batch_size`` at a time into a single multi-image
+        vision prompt. Batches are analyzed concurrently, with at most
+        ``max_concurrency`` (agent config, default: 8) model requests in
+        flight at once. With ``execution_mode='batch'`` the batches are
+        submitted through the OpenAI Batch API instead, trading latency
+        for cost on large offline jobs.
+        
+        Per-image results are cached by image content, so duplicates and
+        re-runs skip the model entirely (``cache_results`` agent config,
+        default: True).
+        
         Args:
             inputs: Dict containing:
                 - sampled_images: List of image paths
@@ -50,6 +111,14 @@ class ObjectDiscoveryAgent(BaseALOAgent):
                 - min_class_frequency: Minimum occurrence (default: 0.05)
                 - max_classes: Maximum number of classes (default: 50)
                 - consolidate_similar: Merge similar classes (default: True)
+                - batch_size: Images per model request (default: 8)
+                - execution_mode: 'online' or 'batch' (default: 'online')
+                - batch_poll_interval: Seconds between Batch API status
+                  checks (default: 30)
+                - early_consolidation_threshold: Number of distinct classes
+                  after which consolidation may start while images are still
+                  being analyzed (default: 10)
+            ctx: Workflow run context; unused, all inputs come from ``inputs``
                 
         Returns:
             Dict with discovered_classes, class_confidence, class_examples
@@ -59,54 +128,166 @@ class ObjectDiscoveryAgent(BaseALOAgent):
         min_frequency = inputs.get('min_class_frequency', 0.05)
         max_classes = inputs.get('max_classes', 50)
         consolidate = inputs.get('consolidate_similar', True)
+        batch_size = max(1, inputs.get('batch_size', 8))
+        execution_mode = inputs.get('execution_mode', 'online')
+        early_threshold = inputs.get('early_consolidation_threshold', 10)
         
         logger.info(f"Discovering objects in {len(sampled_images)} sampled images")
         
-        # Analyze each image
-        all_detections = []
-        class_examples = {}
+        # Bounds model requests and file reads in flight
+        semaphore = asyncio.Semaphore(self.config.get('max_concurrency', 8))
+        
+        # Reuse results for images whose content was already analyzed
+        cache_keys: Dict[str, str] = {}
+        image_detections: Dict[str, List[str]] = {}
+        
+        if self.config.get('cache_results', True):
+            async def lookup(img_path: str) -> None:
+                async with semaphore:
+                    try:
+                        # Keys hash only the start of each file, so cache misses
+                        # are not read in full twice
+                        loop = asyncio.get_running_loop()
+                        head, size = await loop.run_in_executor(None, _read_head, img_path)
+                    except OSError:
+                        return  # Reported when the image is analyzed
+                
+                cache_keys[img_path] = self._cache_key(head, size, prompt)
+                cached = _RESULT_CACHE.get(cache_keys[img_path])
+                if cached is not None:
+                    image_detections[img_path] = cached
+            
+            await asyncio.gather(*(lookup(img_path) for img_path in sampled_images))
+            
+            if image_detections:
+                logger.info(f"Reusing cached results for {len(image_detections)} images")
         
+        # Analyze each distinct image once; repeated paths and duplicate
+        # content share the result of a single request
+        pending: Dict[str, str] = {}
         for img_path in sampled_images:
-            try:
-                detections = self._analyze_image(img_path, prompt)
-                all_detections.extend(detections)
+            if img_path not in image_detections:
+                pending.setdefault(cache_keys.get(img_path, img_path), img_path)
+        
+        pending_images = list(pending.values())
+        batches = [
+            pending_images[i:i + batch_size]
+            for i in range(0, len(pending_images), batch_size)
+        ]
+        
+        def collect(batch: List[str], batch_detections: Any) -> List[str]:
+            """Record a batch result and return the classes it detected."""
+            if isinstance(batch_detections, Exception):
+                for img_path in batch:
+                    logger.error(f"Error analyzing {img_path}: {str(batch_detections)}")
+                return []
+            
+            batch_classes = []
+            for img_path, detections in zip(batch, batch_detections):
+                if isinstance(detections, Exception):
+                    logger.error(f"Error analyzing {img_path}: {str(detections)}")
+                    continue
+                
+                image_detections[img_path] = detections
+                batch_classes.extend(detections)
+                # Empty results may come from a truncated response; retry those next time
+                if detections and img_path in cache_keys:
+                    _RESULT_CACHE.set(cache_keys[img_path], detections)
+            
+            return batch_classes
+        
+        early_consolidation: Optional[asyncio.Future] = None
+        
+        if execution_mode == 'batch':
+            results = await self._analyze_with_batch_api(
+                batches, prompt, inputs.get('batch_poll_interval', 30)
+            )
+            for batch, batch_detections in zip(batches, results):
+                collect(batch, batch_detections)
+        else:
+            # Analyze all batches concurrently, handling results as they arrive
+            async def analyze(batch: List[str]) -> Tuple[List[str], Any]:
+                async with semaphore:
+                    try:
+                        return batch, await self._analyze_image_batch(batch, prompt)
+                    except Exception as e:
+                        return batch, e
+            
+            seen_classes: Set[str] = set()
+            remaining = len(batches)
+            
+            for completed in asyncio.as_completed([analyze(batch) for batch in batches]):
+                batch_classes = collect(*await completed)
+                remaining -= 1
+                
+                if not consolidate or early_consolidation is not None or not remaining:
+                    continue
                 
-                # Store example images for each class
-                for det in detections:
-                    if det not in class_examples:
-                        class_examples[det] = []
-                    if len(class_examples[det]) < 3:  # Store up to 3 examples
-                        class_examples[det].append(img_path)
-                        
-            except Exception as e:
-                logger.error(f"Error analyzing {img_path}: {str(e)}")
+                # Once few new classes show up, start consolidating the
+                # vocabulary seen so far while later batches are analyzed
+                new_classes = set(batch_classes) - seen_classes
+                seen_classes |= new_classes
+                if (len(seen_classes) >= early_threshold
+                        and len(new_classes) <= _NEW_CLASS_RATE * len(seen_classes)):
+                    logger.info(f"Starting consolidation of {len(seen_classes)} classes early")
+                    early_consolidation = asyncio.ensure_future(
+                        self._request_consolidation(sorted(seen_classes))
+                    )
+        
+        all_detections = []
+        class_examples: Dict[str, List[str]] = defaultdict(list)
+        
+        for img_path in sampled_images:
+            detections = image_detections.get(img_path)
+            if detections is None:
+                # Duplicate of an image analyzed under another path
+                representative = pending.get(cache_keys.get(img_path, img_path))
+                if representative is not None:
+                    detections = image_detections.get(representative)
+            if detections is None:
                 continue
+            
+            all_detections.extend(detections)
+            
+            # Store example images for each class
+            for det in detections:
+                examples = class_examples[det]
+                if len(examples) < 3:  # Store up to 3 examples
+                    examples.append(img_path)
         
-        # Count class frequencies
-        class_counts = Counter(all_detections)
         total_detections = len(all_detections)
         
-        # Calculate frequencies
-        class_frequencies = {
-            cls: count / total_detections
-            for cls, count in class_counts.items()
-        }
-        
-        # Filter by minimum frequency
-        filtered_classes = {
-            cls: freq
-            for cls, freq in class_frequencies.items()
-            if freq >= min_frequency
-        }
+        # Count, filter and rank class frequencies in one vectorized pass
+        filtered_classes: Dict[str, float] = {}
+        if all_detections:
+            classes, counts = np.unique(np.asarray(all_detections), return_counts=True)
+            frequencies = counts / total_detections
+            keep = frequencies >= min_frequency
+            classes, frequencies = classes[keep], frequencies[keep]
+            order = np.argsort(-frequencies, kind='stable')
+            filtered_classes = dict(zip(classes[order].tolist(), frequencies[order].tolist()))
         
         # Consolidate similar classes if requested
         if consolidate:
-            filtered_classes = self._consolidate_classes(filtered_classes)
+            partial_mapping = await early_consolidation if early_consolidation else None
+            filtered_classes, mapping = await self._consolidate_classes(
+                filtered_classes, partial_mapping
+            )
+            ranked = sorted(filtered_classes.items(), key=lambda x: x[1], reverse=True)
+            
+            # Group examples under the same consolidated names
+            merged_examples: Dict[str, List[str]] = defaultdict(list)
+            for cls, examples in class_examples.items():
+                target = merged_examples[mapping.get(cls, cls)]
+                for img_path in examples:
+                    if len(target) < 3 and img_path not in target:
+                        target.append(img_path)
+            class_examples = merged_examples
+        else:
+            ranked = list(filtered_classes.items())
         
         # Limit to max_classes
-        final_classes = dict(
-            sorted(filtered_classes.items(), key=lambda x: x[1], reverse=True)[:max_classes]
-        )
+        final_classes = dict(ranked[:max_classes])
         
         discovered_classes = list(final_classes.keys())
         
@@ -116,42 +297,318 @@ class ObjectDiscoveryAgent(BaseALOAgent):
         return {
             'discovered_classes': discovered_classes,
             'class_confidence': final_classes,
-            'class_examples': class_examples,
+            'class_examples': dict(class_examples),
             'total_detections': total_detections
         }
     
-    def _analyze_image(self, image_path: str, prompt: str) -> List[str]:
+    async def _analyze_image_batch(self, image_paths: List[str], prompt: str) -> List[Any]:
         """
-        Analyze a single image and return detected object classes.
+        Analyze several images with one vision-model request.
+        
+        All images are sent as parts of a single multi-image prompt, so the
+        instructions are paid for once per batch rather than once per image.
         
-        This uses the configured vision model (GPT-4V, Claude, etc.)
-        to identify objects in the image.
+        Returns:
+            Per input image, in order, either the list of detected object
+            classes or the Exception raised while reading that image
+            
+        Raises:
+            ValueError: If the response cannot be matched to the images
         """
-        # Create analysis task
-        task_description = f"""
-        Analyze the image at: {image_path}
+        content, read_errors = await self._build_batch_content(image_paths, prompt)
+        num_readable = read_errors.count(None)
+        if not num_readable:
+            return read_errors
         
-        {prompt}
+        text = await self.aquick_call(None, content)
+        
+        parsed = self._parse_batch_response(text, num_readable)
+        return self._merge_read_errors(read_errors, parsed)
+    
+    async def _analyze_with_batch_api(
+        self,
+        batches: List[List[str]],
+        prompt: str,
+        poll_interval: float
+    ) -> List[Any]:
+        """
+        Analyze image batches through the OpenAI Batch API.
+        
+        Every batch becomes one request line in a JSONL file that is uploaded
+        and processed asynchronously by OpenAI. Lines are written to
+        temporary files as they are built, and a new file, submitted as its
+        own job, is started whenever one would exceed the Batch API input
+        limits. All jobs are polled until they finish.
+        
+        Returns:
+            Per batch, either the parsed class lists or the Exception that
+            made that request fail
+        """
+        if self.config.get('model_provider', 'openai') != 'openai':
+            raise ValueError("execution_mode='batch' is only supported for the openai provider")
+        
+        from openai import AsyncOpenAI
+        
+        client = AsyncOpenAI(api_key=self.config.get('api_key'))
+        model = self._model_name()
+        
+        batch_read_errors = []
+        failures: Dict[str, str] = {}
+        input_files: List[Tuple[Path, List[str]]] = []
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            out = None
+            size = 0
+            try:
+                for i, batch in enumerate(batches):
+                    content, read_errors = await self._build_batch_content(batch, prompt)
+                    batch_read_errors.append(read_errors)
+                    if None not in read_errors:
+                        continue  # No readable images, nothing to submit
+                    
+                    custom_id = f"batch-{i}"
+                    line = (json.dumps({
+                        'custom_id': custom_id,
+                        'method': 'POST',
+                        'url': '/v1/chat/completions',
+                        'body': {
+                            'model': model,
+                            'temperature': self.config.get('temperature', 0.7),
+                            'messages': [
+                                {'role': 'system', 'content': self._persona_prompt()},
+                                {'role': 'user', 'content': content}
+                            ]
+                        }
+                    }) + '\n').encode('utf-8')
+                    
+                    if len(line) > _BATCH_FILE_MAX_BYTES:
+                        failures[custom_id] = "request exceeds the batch input file size limit"
+                        continue
+                    
+                    # Start a new input file once the current one is full
+                    if (out is None or size + len(line) > _BATCH_FILE_MAX_BYTES
+                            or len(input_files[-1][1]) >= _BATCH_FILE_MAX_REQUESTS):
+                        if out is not None:
+                            out.close()
+                        path = Path(tmp_dir) / f"discovery_batch_{len(input_files)}.jsonl"
+                        out = open(path, 'wb')
+                        input_files.append((path, []))
+                        size = 0
+                    
+                    out.write(line)
+                    size += len(line)
+                    input_files[-1][1].append(custom_id)
+            finally:
+                if out is not None:
+                    out.close()
+            
+            jobs = await asyncio.gather(
+                *(self._submit_batch_job(client, path, len(ids)) for path, ids in input_files)
+            )
+        
+        outputs = await asyncio.gather(
+            *(self._collect_batch_job(client, job, poll_interval) for job in jobs),
+            return_exceptions=True
+        )
+        
+        errors = [output for output in outputs if isinstance(output, BaseException)]
+        if errors and len(errors) == len(outputs):
+            raise errors[0]
         
-        Return ONLY a comma-separated list of object class names.
-        Example: "person, car, dog, tree, building"
+        responses: Dict[str, Any] = {}
+        for (_, custom_ids), output in zip(input_files, outputs):
+            if isinstance(output, BaseException):
+                logger.error(str(output))
+                failures.update((custom_id, str(output)) for custom_id in custom_ids)
+            else:
+                responses.update(output)
+        
+        results: List[Any] = []
+        for i, read_errors in enumerate(batch_read_errors):
+            if None not in read_errors:
+                results.append(read_errors)
+                continue
+            
+            custom_id = f"batch-{i}"
+            if custom_id in failures:
+                results.append(RuntimeError(f"Batch request failed: {failures[custom_id]}"))
+                continue
+            
+            record = responses.get(custom_id)
+            if not record or record.get('error') or record['response']['status_code'] != 200:
+                error = record.get('error') if record else 'missing from batch output'
+                results.append(RuntimeError(f"Batch request failed: {error}"))
+                continue
+            
+            text = record['response']['body']['choices'][0]['message']['content']
+            try:
+                parsed = self._parse_batch_response(text, read_errors.count(None))
+            except ValueError as e:
+                results.append(e)
+                continue
+            results.append(self._merge_read_errors(read_errors, parsed))
+        
+        return results
+    
+    async def _submit_batch_job(self, client: Any, path: Path, num_requests: int) -> Any:
+        """Upload a JSONL input file and start a Batch API job for it."""
+        with open(path, 'rb') as f:
+            input_file = await client.files.create(file=(path.name, f), purpose='batch')
+        job = await client.batches.create(
+            input_file_id=input_file.id,
+            endpoint='/v1/chat/completions',
+            completion_window='24h'
+        )
+        logger.info(f"Submitted batch job {job.id} with {num_requests} requests")
+        return job
+    
+    async def _collect_batch_job(
+        self,
+        client: Any,
+        job: Any,
+        poll_interval: float
+    ) -> Dict[str, Any]:
+        """
+        Poll a Batch API job until it finishes.
+        
+        Returns:
+            The job's output records keyed by custom_id
+        """
+        while job.status not in ('completed', 'failed', 'expired', 'cancelled'):
+            await asyncio.sleep(poll_interval)
+            job = await client.batches.retrieve(job.id)
+        
+        if job.status != 'completed' or not job.output_file_id:
+            raise RuntimeError(f"Batch job {job.id} finished with status: {job.status}")
+        
+        output = await client.files.content(job.output_file_id)
+        
+        responses = {}
+        for line in output.text.splitlines():
+            if line.strip():
+                record = json.loads(line)
+                responses[record['custom_id']] = record
+        return responses
+    
+    async def _read_image(self, image_path: str) -> bytes:
+        """Read an image file without blocking the event loop."""
+        if aiofiles is not None:
+            async with aiofiles.open(image_path, 'rb') as f:
+                data: bytes = await f.read()
+                return data
+        
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, _read_file, image_path)
+    
+    def _cache_key(self, image_head: bytes, image_size: int, prompt: str) -> str:
         """
+        Content-addressed cache key for an image analysis.
         
-        task = self.create_task(
-            description=task_description,
-            expected_output="Comma-separated list of object classes"
+        Hashes the first 64 KiB and the size of the image together with the
+        provider, model and prompt, so duplicate files share a key while
+        prompt or model changes do not reuse stale results. Files are only
+        told apart by their first 64 KiB and size, which for compressed
+        images differ unless the files are identical.
+        """
+        model_provider = self.config.get('model_provider', 'openai')
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(
+            f"{model_provider}\0{self._model_name()}\0{prompt}\0{image_size}\0".encode('utf-8')
         )
+        digest.update(image_head)
+        return digest.hexdigest()
+    
+    async def _build_batch_content(
+        self,
+        image_paths: List[str],
+        prompt: str
+    ) -> Tuple[List[Dict[str, Any]], List[Optional[Exception]]]:
+        """
+        Build multi-image message content with each image inlined as base64.
         
-        # Run the crew
-        result = self.run_crew([task])
+        Images that cannot be read are left out of the content.
         
-        # Parse result into list of classes
-        classes_str = result.get('result', '')
-        classes = [cls.strip().lower() for cls in classes_str.split(',') if cls.strip()]
+        Returns:
+            The message content, and per input image the Exception raised
+            while reading it (None if it was included)
+        """
+        images = await asyncio.gather(
+            *(self._read_image(p) for p in image_paths),
+            return_exceptions=True
+        )
+        readable: List[Tuple[str, bytes]] = []
+        read_errors: List[Optional[Exception]] = []
+        for image_path, image_bytes in zip(image_paths, images):
+            if isinstance(image_bytes, bytes):
+                readable.append((image_path, image_bytes))
+                read_errors.append(None)
+            elif isinstance(image_bytes, Exception):
+                read_errors.append(image_bytes)
+            else:
+                raise image_bytes  # e.g. cancellation
+        
+        content: List[Dict[str, Any]] = [{
+            'type': 'text',
+            'text': f"""
+        {prompt}
         
-        return classes
+        You are given {len(readable)} images.
+        Return exactly {len(readable)} lines, one per input image, in order.
+        Each line must be ONLY a comma-separated list of object class names.
+        Example line: "person, car, dog, tree, building"
+        """
+        }]
+        
+        for image_path, image_bytes in readable:
+            mime_type = mimetypes.guess_type(image_path)[0] or 'image/jpeg'
+            encoded = base64.b64encode(image_bytes).decode('ascii')
+            content.append({
+                'type': 'image_url',
+                'image_url': {'url': f"data:{mime_type};base64,{encoded}"}
+            })
+        
+        return content, read_errors
+    
+    def _merge_read_errors(
+        self,
+        read_errors: List[Optional[Exception]],
+        parsed: List[List[str]]
+    ) -> List[Any]:
+        """Interleave per-image read errors with the parsed model output."""
+        remaining = iter(parsed)
+        return [error if error is not None else next(remaining) for error in read_errors]
+    
+    def _parse_batch_response(self, text: str, num_images: int) -> List[List[str]]:
+        """
+        Split a multi-image response into one class list per image.
+        
+        Lines are matched to images by position, so a response with a
+        missing or extra line cannot be attributed reliably.
+        
+        Raises:
+            ValueError: If the response does not have one line per image
+        """
+        lines = [
+            _LINE_PREFIX.sub('', line).strip().strip('"')
+            for line in text.strip().splitlines()
+            if line.strip()
+        ]
+        
+        if len(lines) != num_images:
+            raise ValueError(
+                f"Expected {num_images} lines in model response, got {len(lines)}"
+            )
+        
+        return [
+            [cls.strip().lower() for cls in line.split(',') if cls.strip()]
+            for line in lines
+        ]
     
-    def _consolidate_classes(self, class_frequencies: Dict[str, float]) -> Dict[str, float]:
+    async def _consolidate_classes(
+        self,
+        class_frequencies: Dict[str, float],
+        partial_mapping: Optional[Dict[str, str]] = None
+    ) -> Tuple[Dict[str, float], Dict[str, str]]:
         """
         Consolidate similar classes into single categories.
         
@@ -159,12 +616,55 @@ class ObjectDiscoveryAgent(BaseALOAgent):
         - "sedan", "suv", "truck" → "vehicle"
         - "golden_retriever", "labrador" → "dog"
         - "apple", "banana", "orange" → "fruit"
+        
+        Args:
+            class_frequencies: Class name → frequency
+            partial_mapping: Consolidations already obtained for some of the
+                classes; only the remaining classes are sent to the model
+                
+        Returns:
+            Consolidated class → summed frequency, and the original →
+            consolidated class mapping that was applied
+        """
+        mapping = dict(partial_mapping or {})
+        
+        missing = [cls for cls in class_frequencies if cls not in mapping]
+        if missing:
+            mapping.update(
+                await self._request_consolidation(missing, sorted(set(mapping.values())))
+            )
+        
+        consolidated: Dict[str, float] = {}
+        for cls, freq in class_frequencies.items():
+            target = mapping.get(cls, cls)
+            consolidated[target] = consolidated.get(target, 0.0) + freq
+        
+        return consolidated, mapping
+    
+    async def _request_consolidation(
+        self,
+        class_names: List[str],
+        existing_categories: Optional[List[str]] = None
+    ) -> Dict[str, str]:
+        """
+        Ask the model how to merge the given classes.
+        
+        Returns:
+            Mapping of original → consolidated class names. Empty if the
+            request fails, in which case classes are kept as they are.
         """
         # Create consolidation task
-        classes_str = ', '.join(class_frequencies.keys())
+        classes_str = ', '.join(class_names)
+        existing_str = ''
+        if existing_categories:
+            existing_str = (
+                f"Prefer these existing categories where they fit: "
+                f"{', '.join(existing_categories)}"
+            )
         
         task_description = f"""
         Given these object classes: {classes_str}
+        {existing_str}
         
         Consolidate similar or overlapping classes into broader categories.
         For example:
@@ -176,17 +676,31 @@ class ObjectDiscoveryAgent(BaseALOAgent):
         {{"sedan": "vehicle", "suv": "vehicle", "golden_retriever": "dog"}}
         """
         
-        task = self.create_task(
-            description=task_description,
-            expected_output="JSON mapping of class consolidations"
-        )
+        try:
+            text = await self.aquick_call(None, task_description)
+            return self._parse_consolidation(text)
+        except Exception as e:
+            logger.warning(f"Class consolidation failed, keeping original classes: {str(e)}")
+            return {}
+    
+    def _parse_consolidation(self, text: str) -> Dict[str, str]:
+        """Extract the original → consolidated mapping from a model response."""
+        start, end = text.find('{'), text.rfind('}')
+        if start == -1 or end < start:
+            logger.warning("No consolidation mapping found in model response")
+            return {}
         
-        result = self.run_crew([task])
+        try:
+            raw_mapping = json.loads(text[start:end + 1])
+        except json.JSONDecodeError as e:
+            logger.warning(f"Could not parse consolidation mapping: {str(e)}")
+            return {}
         
-        # Parse consolidation mapping
-        # (In real implementation, parse JSON and apply mapping)
-        # For now, return original classes
-        return class_frequencies
+        return {
+            str(original).strip().lower(): str(target).strip().lower()
+            for original, target in raw_mapping.items()
+            if str(target).strip()
+        }
     
     def _default_prompt(self) -> str:
         """Default prompt for object discovery."""
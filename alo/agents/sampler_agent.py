@@ -6,14 +6,75 @@ without processing the entire dataset.
 """
 
 import os
+import math
 import random
 import logging
-from typing import Dict, List, Any
-from pathlib import Path
+from itertools import islice
+from typing import Dict, List, Any, Iterable, Iterator, Sequence, Tuple
 from .base_agent import BaseALOAgent
 
 logger = logging.getLogger(__name__)
 
+# Supported image extensions
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.webp')
+
+
+def _random_unit() -> float:
+    """Uniform random number in the open interval (0, 1)."""
+    u = random.random()
+    while u == 0.0:
+        u = random.random()
+    return u
+
+
+def random_sample_reservoir(stream: Iterable[Any], k: int) -> List[Any]:
+    """
+    Draw a uniform random sample of k items from a stream of unknown length.
+    
+    Uses Li's Algorithm L, which keeps only the k sampled items in memory
+    and skips ahead geometrically instead of drawing a random number per
+    item.
+    
+    Args:
+        stream: Items to sample from
+        k: Number of items to sample
+        
+    Returns:
+        Up to k items; the whole stream if it has fewer than k items
+    """
+    if k <= 0:
+        return []
+    
+    items = iter(stream)
+    reservoir = list(islice(items, k))
+    if len(reservoir) < k:
+        return reservoir
+    
+    w = math.exp(math.log(_random_unit()) / k)
+    while True:
+        skip = math.floor(math.log(_random_unit()) / math.log1p(-w))
+        item = next(islice(items, skip, None), None)
+        if item is None:
+            return reservoir
+        reservoir[random.randrange(k)] = item
+        w *= math.exp(math.log(_random_unit()) / k)
+
+
+def _pick_indices(stream: Iterable[Any], indices: Iterable[int]) -> List[Any]:
+    """Collect the stream items at the given ascending indices."""
+    picked = []
+    targets = iter(indices)
+    target = next(targets, None)
+    
+    for i, item in enumerate(stream):
+        if target is None:
+            break
+        if i == target:
+            picked.append(item)
+            target = next(targets, None)
+    
+    return picked
+
 
 class IntelligentSamplerAgent(BaseALOAgent):
     """
@@ -57,11 +118,14 @@ class IntelligentSamplerAgent(BaseALOAgent):
         max_samples = inputs.get('max_samples', 100)
         strategy = inputs.get('strategy', 'diverse')
         
+        if not dataset_path:
+            raise ValueError("dataset_path is required")
+        
         logger.info(f"Starting intelligent sampling of {dataset_path}")
         
-        # Get all images from dataset
-        all_images = self._get_all_images(dataset_path)
-        total_images = len(all_images)
+        # Count images without keeping their paths; samples are drawn in a
+        # second pass so memory stays proportional to the sample size
+        total_images = sum(1 for _ in self._iter_images(dataset_path, sort=False))
         
         logger.info(f"Found {total_images} images in dataset")
         
@@ -73,15 +137,21 @@ class IntelligentSamplerAgent(BaseALOAgent):
         
         logger.info(f"Sampling {sample_size} images ({sample_size/total_images*100:.2f}%)")
         
-        # Apply sampling strategy
+        # Apply sampling strategy; only evenly spaced picks depend on the
+        # sorted path order, the other strategies walk in directory order
         if strategy == 'diverse':
-            sampled_images = self._diverse_sampling(all_images, sample_size)
-        elif strategy == 'random':
-            sampled_images = random.sample(all_images, sample_size)
+            sampled_images = _pick_indices(
+                self._iter_images(dataset_path),
+                self._diverse_indices(total_images, sample_size)
+            )
         elif strategy == 'temporal':
-            sampled_images = self._temporal_sampling(all_images, sample_size)
+            sampled_images = self._temporal_sampling(
+                self._iter_images(dataset_path, sort=False), total_images, sample_size
+            )
         else:
-            sampled_images = random.sample(all_images, sample_size)
+            sampled_images = sorted(random_sample_reservoir(
+                self._iter_images(dataset_path, sort=False), sample_size
+            ))
         
         metadata = {
             'total_images': total_images,
@@ -97,46 +167,90 @@ class IntelligentSamplerAgent(BaseALOAgent):
             'sampling_metadata': metadata
         }
     
-    def _get_all_images(self, dataset_path: str) -> List[str]:
-        """Get all image files from dataset path."""
-        dataset_dir = Path(dataset_path)
+    def _iter_images(self, dataset_path: str, sort: bool = True) -> Iterator[str]:
+        """
+        Yield image files under dataset path.
         
-        # Supported image extensions
-        image_extensions = {'.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.webp'}
+        Walks the tree once with os.scandir, matching extensions
+        case-insensitively, so the dataset is never materialized as a list
+        of paths.
         
-        images = []
-        for ext in image_extensions:
-            images.extend([str(p) for p in dataset_dir.rglob(f'*{ext}')])
+        With ``sort``, files come in sorted path order, the same order as a
+        sorted rglob. That needs each directory's entry names sorted in
+        memory while it is walked, so a flat dataset still holds every file
+        name of its folder. Without ``sort``, files come in directory order
+        and only the open directory iterators are held.
+        """
+        pending = [self._entries(os.fspath(dataset_path), sort)]
         
-        return sorted(images)
+        while pending:
+            item = next(pending[-1], None)
+            if item is None:
+                pending.pop()
+                continue
+            
+            path, is_dir = item
+            if is_dir:
+                pending.append(self._entries(path, sort))
+            elif path.lower().endswith(IMAGE_EXTENSIONS):
+                yield path
     
-    def _diverse_sampling(self, images: List[str], sample_size: int) -> List[str]:
+    def _entries(self, directory: str, sort: bool) -> Iterator[Tuple[str, bool]]:
+        """Yield (path, is_dir) for each entry of a directory."""
+        with os.scandir(directory) as entries:
+            if not sort:
+                for entry in entries:
+                    yield entry.path, entry.is_dir(follow_symlinks=False)
+                return
+            
+            # Keying directories as "name/" makes the depth-first walk produce
+            # the same order as sorting the full paths
+            names = sorted(
+                entry.name + '/' if entry.is_dir(follow_symlinks=False) else entry.name
+                for entry in entries
+            )
+        
+        for name in names:
+            if name.endswith('/'):
+                yield os.path.join(directory, name[:-1]), True
+            else:
+                yield os.path.join(directory, name), False
+    
+    def _diverse_indices(self, total: int, sample_size: int) -> Sequence[int]:
         """
-        Sample images with diversity (spread evenly across dataset).
+        Indices that spread a sample evenly across a dataset.
         
         This ensures temporal and spatial diversity by sampling
         at regular intervals across the dataset.
         """
-        if len(images) <= sample_size:
-            return images
-        
-        # Sample at regular intervals for diversity
-        interval = len(images) // sample_size
-        sampled = []
+        if total <= sample_size:
+            return range(total)
         
-        for i in range(sample_size):
-            idx = (i * interval) + (interval // 2)  # Middle of each interval
-            if idx < len(images):
-                sampled.append(images[idx])
-        
-        return sampled
+        # Middle of each interval
+        interval = total // sample_size
+        return range(interval // 2, interval * sample_size, interval)
     
-    def _temporal_sampling(self, images: List[str], sample_size: int) -> List[str]:
+    def _diverse_sampling(self, images: List[str], sample_size: int) -> List[str]:
+        """Sample a list of images at regular intervals."""
+        return [images[i] for i in self._diverse_indices(len(images), sample_size)]
+    
+    def _temporal_sampling(
+        self,
+        images: Iterable[str],
+        total: int,
+        sample_size: int
+    ) -> List[str]:
         """
         Sample images based on temporal diversity (file timestamps).
+        
+        Only a strided subset of about 4x the sample size is stat'ed, so
+        large datasets do not pay one stat call per file.
         """
+        stride = max(1, total // (sample_size * 4)) if sample_size > 0 else 1
+        candidates = islice(images, 0, None, stride)
+        
         # Sort by modification time
-        images_with_time = [(img, os.path.getmtime(img)) for img in images]
+        images_with_time = [(img, os.stat(img).st_mtime) for img in candidates]
         images_with_time.sort(key=lambda x: x[1])
         
         # Sample at regular time intervals
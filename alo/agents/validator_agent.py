@@ -5,8 +5,11 @@ This agent validates predictions for quality, consistency, and correctness.
 """
 
 import logging
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Any
 from .base_agent import BaseALOAgent
+from ._bbox_kernels import overlap_counts
 from crewai import Task
 
 logger = logging.getLogger(__name__)
@@ -63,32 +66,59 @@ class LLMValidatorAgent(BaseALOAgent):
             'validation_issues': []
         }
         
-        for i, pred in enumerate(predictions):
+        # Column-wise views of the predictions, so checks run over whole arrays
+        num_predictions = len(predictions)
+        confidences = np.fromiter(
+            (pred.get('confidence', 1.0) for pred in predictions),
+            dtype=np.float64,
+            count=num_predictions
+        )
+        classes = np.array([pred.get('class', '') for pred in predictions], dtype=object)
+        
+        low_confidence = confidences < min_confidence
+        if expected_classes:
+            # Hashed membership: np.isin on object arrays compares every class pair
+            expected_set = frozenset(expected_classes)
+            unexpected_class = np.fromiter(
+                (cls not in expected_set for cls in classes),
+                dtype=bool,
+                count=num_predictions
+            )
+        else:
+            unexpected_class = np.zeros(num_predictions, dtype=bool)
+        
+        if consistency_check:
+            overlap_counts = self._count_overlaps(predictions)
+        else:
+            overlap_counts = np.zeros(num_predictions, dtype=np.int64)
+        
+        flagged = low_confidence | unexpected_class | (overlap_counts > 0)
+        
+        # Only flagged predictions need per-item issue messages
+        for i in np.flatnonzero(flagged):
+            pred = predictions[i]
             issues = []
             
-            # Check confidence
-            confidence = pred.get('confidence', 1.0)
-            if confidence < min_confidence:
-                issues.append(f"Low confidence: {confidence:.2f}")
+            if low_confidence[i]:
+                issues.append(f"Low confidence: {confidences[i]:.2f}")
             
-            # Check if class is in expected classes
-            pred_class = pred.get('class', '')
-            if expected_classes and pred_class not in expected_classes:
-                issues.append(f"Unexpected class: {pred_class}")
+            if unexpected_class[i]:
+                issues.append(f"Unexpected class: {classes[i]}")
             
             # Consistency checks
             if consistency_check:
-                consistency_issues = self._check_consistency(pred, predictions)
+                consistency_issues = self._check_consistency(pred, int(overlap_counts[i]))
                 issues.extend(consistency_issues)
             
-            if issues:
-                validation_results['flagged_predictions'].append({
-                    'prediction_index': i,
-                    'prediction': pred,
-                    'issues': issues
-                })
-            else:
-                validation_results['valid_predictions'] += 1
+            validation_results['flagged_predictions'].append({
+                'prediction_index': int(i),
+                'prediction': pred,
+                'issues': issues
+            })
+        
+        validation_results['valid_predictions'] = (
+            num_predictions - len(validation_results['flagged_predictions'])
+        )
         
         # Calculate quality score
         quality_score = (
@@ -103,11 +133,7 @@ class LLMValidatorAgent(BaseALOAgent):
         
         return validation_results
     
-    def _check_consistency(
-        self, 
-        pred: Dict[str, Any], 
-        all_predictions: List[Dict[str, Any]]
-    ) -> List[str]:
+    def _check_consistency(self, pred: Dict[str, Any], overlap_count: int) -> List[str]:
         """
         Check for consistency issues in predictions.
         
@@ -119,34 +145,59 @@ class LLMValidatorAgent(BaseALOAgent):
         issues = []
         
         # Check for overlapping predictions
-        if 'bbox' in pred:
-            overlaps = self._find_overlapping_boxes(pred, all_predictions)
-            if overlaps:
-                issues.append(f"Overlaps with {len(overlaps)} other predictions")
+        if overlap_count:
+            issues.append(f"Overlaps with {overlap_count} other predictions")
         
         return issues
     
-    def _find_overlapping_boxes(
+    def _count_overlaps(self, predictions: List[Dict[str, Any]]) -> np.ndarray:
+        """
+        Count overlapping bounding boxes for every prediction.
+        
+        Boxes are packed into a single array and compared vectorially instead
+        of pair by pair. Predictions without a bbox get a count of 0.
+        """
+        counts = np.zeros(len(predictions), dtype=np.int64)
+        boxed = [i for i, pred in enumerate(predictions) if pred.get('bbox')]
+        
+        if len(boxed) < 2:
+            return counts
+        
+        try:
+            boxes = np.asarray([predictions[i]['bbox'] for i in boxed], dtype=np.float64)
+        except (TypeError, ValueError):
+            boxes = None
+        
+        if boxes is None or boxes.ndim != 2 or boxes.shape[1] != 4:
+            # Irregular boxes, fall back to pairwise checks
+            for i in boxed:
+                counts[i] = self._count_overlapping_boxes(predictions[i], predictions)
+            return counts
+        
+        counts[boxed] = overlap_counts(boxes)
+        return counts
+    
+    def _count_overlapping_boxes(
         self, 
         pred: Dict[str, Any], 
         all_predictions: List[Dict[str, Any]]
-    ) -> List[Dict[str, Any]]:
-        """Find predictions with overlapping bounding boxes."""
-        overlaps = []
+    ) -> int:
+        """Count predictions whose bounding boxes overlap this one."""
         pred_bbox = pred.get('bbox')
         
         if not pred_bbox:
-            return overlaps
+            return 0
         
+        count = 0
         for other_pred in all_predictions:
-            if other_pred == pred:
+            if other_pred is pred:
                 continue
             
             other_bbox = other_pred.get('bbox')
             if other_bbox and self._boxes_overlap(pred_bbox, other_bbox):
-                overlaps.append(other_pred)
+                count += 1
         
-        return overlaps
+        return count
     
     def _boxes_overlap(self, bbox1: List[float], bbox2: List[float]) -> bool:
         """Check if two bounding boxes overlap."""
@@ -154,8 +205,9 @@ class LLMValidatorAgent(BaseALOAgent):
         x1, y1, w1, h1 = bbox1
         x2, y2, w2, h2 = bbox2
         
-        # Check if boxes overlap
-        return not (x1 + w1 < x2 or x2 + w2 < x1 or y1 + h1 < y2 or y2 + h2 < y1)
+        # Check if boxes overlap; '&' evaluates all four comparisons without
+        # short-circuit branches, matching the vectorized overlap kernels
+        return (x2 <= x1 + w1) & (x1 <= x2 + w2) & (y2 <= y1 + h1) & (y1 <= y2 + h2)
 
 
 class EnsembleValidatorAgent(BaseALOAgent):
@@ -199,24 +251,32 @@ class EnsembleValidatorAgent(BaseALOAgent):
             'consensus_invalid': 0
         }
         
-        # Run each validation strategy
-        for strategy in strategies:
-            strategy_result = self._run_strategy(strategy, predictions)
-            results['strategy_results'][strategy] = strategy_result
+        # Run the validation strategies concurrently; they are independent
+        if len(strategies) > 1:
+            with ThreadPoolExecutor(max_workers=len(strategies)) as executor:
+                futures = {
+                    strategy: executor.submit(self._run_strategy, strategy, predictions)
+                    for strategy in strategies
+                }
+                for strategy, future in futures.items():
+                    results['strategy_results'][strategy] = future.result()
+        else:
+            for strategy in strategies:
+                results['strategy_results'][strategy] = self._run_strategy(strategy, predictions)
         
         # Calculate consensus
         # (Prediction is valid only if all strategies agree)
-        for i in range(len(predictions)):
-            all_valid = all(
-                results['strategy_results'][s].get('valid_indices', set()) 
-                and i in results['strategy_results'][s]['valid_indices']
-                for s in strategies
-            )
-            
-            if all_valid:
-                results['consensus_valid'] += 1
-            else:
-                results['consensus_invalid'] += 1
+        strategy_sets = sorted(
+            (results['strategy_results'][s].get('valid_indices', set()) for s in strategies),
+            key=len
+        )
+        if strategy_sets:
+            # Intersect starting from the smallest set to keep the work minimal
+            consensus = set(strategy_sets[0]).intersection(*strategy_sets[1:])
+            results['consensus_valid'] = len(consensus)
+        else:
+            results['consensus_valid'] = len(predictions)
+        results['consensus_invalid'] = len(predictions) - results['consensus_valid']
         
         results['consensus_score'] = (
             results['consensus_valid'] / len(predictions)
@@ -240,10 +300,12 @@ class EnsembleValidatorAgent(BaseALOAgent):
     def _confidence_validation(self, predictions: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Validate based on confidence scores."""
         threshold = 0.7
-        valid_indices = {
-            i for i, pred in enumerate(predictions)
-            if pred.get('confidence', 0) >= threshold
-        }
+        confidences = np.fromiter(
+            (pred.get('confidence', 0) for pred in predictions),
+            dtype=np.float64,
+            count=len(predictions)
+        )
+        valid_indices = set(np.flatnonzero(confidences >= threshold).tolist())
         return {'valid_indices': valid_indices, 'threshold': threshold}
     
     def _consistency_validation(self, predictions: List[Dict[str, Any]]) -> Dict[str, Any]:
@@ -0,0 +1,63 @@
+"""
+Client-side rate limiting for outbound API calls.
+"""
+
+import time
+import asyncio
+import threading
+from typing import Optional
+
+
+class RateLimiter:
+    """
+    Token bucket limiting calls to a number of requests per minute.
+    
+    Tokens refill continuously at ``rpm / 60`` per second up to ``burst``.
+    A caller that finds the bucket empty reserves its tokens anyway and
+    sleeps until they have been refilled, so concurrent callers queue up
+    in order instead of racing for the next token.
+    
+    Args:
+        rpm: Allowed requests per minute; None disables limiting
+        burst: Bucket capacity (default: one second's worth of requests)
+        
+    Example:
+        >>> limiter = RateLimiter(rpm=120)
+        >>> limiter.acquire()
+        >>> client.get_all_project_per_client_id(client_id)
+    """
+    
+    def __init__(self, rpm: Optional[float] = None, burst: Optional[float] = None):
+        if rpm is not None and rpm <= 0:
+            raise ValueError("rpm must be positive")
+        
+        self.rpm = rpm
+        self.burst = float(burst if burst is not None else max(1.0, (rpm or 0) / 60))
+        self._tokens = self.burst
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self, tokens: float = 1) -> None:
+        """Block until ``tokens`` requests may be made."""
+        wait_time = self._reserve(tokens)
+        if wait_time > 0:
+            time.sleep(wait_time)
+    
+    async def acquire_async(self, tokens: float = 1) -> None:
+        """Wait, without blocking the event loop, until ``tokens`` requests may be made."""
+        wait_time = self._reserve(tokens)
+        if wait_time > 0:
+            await asyncio.sleep(wait_time)
+    
+    def _reserve(self, tokens: float) -> float:
+        """Take tokens from the bucket and return how long to wait for them."""
+        if self.rpm is None:
+            return 0.0
+        
+        rate = self.rpm / 60
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._last_refill) * rate)
+            self._last_refill = now
+            self._tokens -= tokens
+            return max(0.0, -self._tokens / rate)
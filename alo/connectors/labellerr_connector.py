@@ -2,9 +2,20 @@
 Labellerr Connector - Integration with Labellerr platform via SDK.
 """
 
+import os
+import copy
+import stat
+import json
+import asyncio
+import hashlib
 import logging
-from typing import Dict, List, Any, Optional
+import tempfile
+import threading
+from concurrent.futures import TimeoutError as FutureTimeoutError, wait
+from typing import Dict, List, Any, Optional, Tuple
 from pathlib import Path
+from ._ratelimit import RateLimiter
+from alo.utils.cache import ResultCache
 
 try:
     from labellerr.client import LabellerrClient
@@ -16,6 +27,110 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Buffer size for reading and writing annotation files
+_IO_BUFFER_SIZE = 1 << 20
+
+# Seconds each async pre-annotation upload may take
+_UPLOAD_TIMEOUT = 600
+
+# One client and rate limiter per credential pair, shared by connectors so
+# they reuse its connection pool and draw on one request budget per
+# account; reference counts decide when close() really closes the client
+_CLIENT_CACHE: Dict[Tuple[str, str], Tuple[LabellerrClient, RateLimiter]] = {}
+_CLIENT_REFCOUNTS: Dict[Tuple[str, str], int] = {}
+_CLIENT_LOCK = threading.Lock()
+
+# Project listings, shared by all connectors and persisted across processes
+_PROJECT_CACHE = ResultCache('projects', maxsize=256, ttl=300)
+
+
+def _check_annotation_file(annotation_file: str) -> Path:
+    """
+    Validate an annotation file with a single stat call.
+    
+    Raises:
+        FileNotFoundError: If the file does not exist
+        ValueError: If the path is not a regular file
+    """
+    try:
+        mode = os.stat(annotation_file).st_mode
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Annotation file not found: {annotation_file}") from None
+    if not stat.S_ISREG(mode):
+        raise ValueError(f"Annotation path is not a file: {annotation_file}")
+    return Path(annotation_file)
+
+
+def _merge_coco(annotation_files: List[Path]) -> Dict[str, Any]:
+    """
+    Merge several COCO documents into one.
+    
+    Categories are unified by name and images by ``file_name``, so a merged
+    upload matches uploading the files one by one. Image, annotation and
+    category ids are renumbered so ids from different files cannot collide.
+    Annotations whose image or category is missing from their file are
+    dropped. Top-level keys other than images/annotations/categories are
+    taken from the first file.
+    """
+    merged: Dict[str, Any] = {}
+    images: List[Dict[str, Any]] = []
+    image_ids: Dict[str, int] = {}
+    annotations: List[Dict[str, Any]] = []
+    category_ids: Dict[str, int] = {}
+    categories: List[Dict[str, Any]] = []
+    dropped = 0
+    
+    for annotation_file in annotation_files:
+        with open(annotation_file, 'rb', buffering=_IO_BUFFER_SIZE) as f:
+            coco = json.load(f)
+        
+        for key, value in coco.items():
+            if key not in ('images', 'annotations', 'categories'):
+                merged.setdefault(key, value)
+        
+        category_map = {}
+        for category in coco.get('categories', []):
+            name = category.get('name')
+            if name not in category_ids:
+                category_ids[name] = len(categories) + 1
+                categories.append({**category, 'id': category_ids[name]})
+            category_map[category.get('id')] = category_ids[name]
+        
+        image_map = {}
+        for image in coco.get('images', []):
+            file_name = image.get('file_name')
+            if file_name is not None and file_name in image_ids:
+                image_map[image.get('id')] = image_ids[file_name]
+                continue
+            
+            new_id = len(images) + 1
+            images.append({**image, 'id': new_id})
+            image_map[image.get('id')] = new_id
+            if file_name is not None:
+                image_ids[file_name] = new_id
+        
+        for annotation in coco.get('annotations', []):
+            image_id = image_map.get(annotation.get('image_id'))
+            category_id = category_map.get(annotation.get('category_id'))
+            if image_id is None or category_id is None:
+                dropped += 1
+                continue
+            
+            annotations.append({
+                **annotation,
+                'id': len(annotations) + 1,
+                'image_id': image_id,
+                'category_id': category_id,
+            })
+    
+    if dropped:
+        logger.warning(f"Dropped {dropped} annotations with unknown image or category ids")
+    
+    merged['images'] = images
+    merged['annotations'] = annotations
+    merged['categories'] = categories
+    return merged
+
 
 class LabellerrConnector:
     """
@@ -28,6 +143,9 @@ class LabellerrConnector:
         api_key: Labellerr API key
         api_secret: Labellerr API secret
         client_id: Labellerr client ID
+        rpm: Maximum Labellerr API requests per minute (default: unlimited).
+            The limit is shared by all connectors with the same credentials;
+            leave it unset to use the one they already have
         
     Example:
         >>> connector = LabellerrConnector(
@@ -38,17 +156,41 @@ class LabellerrConnector:
         >>> connector.push_preannotations(project_id, annotations)
     """
     
-    def __init__(self, api_key: str, api_secret: str, client_id: Optional[str] = None):
+    def __init__(
+        self,
+        api_key: str,
+        api_secret: str,
+        client_id: Optional[str] = None,
+        rpm: Optional[float] = None,
+    ):
         """Initialize the connector with Labellerr credentials."""
         self.api_key = api_key
         self.api_secret = api_secret
         self.client_id = client_id
+        self._project_index: Dict[str, Dict[str, Any]] = {}
+        self._indexed_projects: Optional[List[Dict[str, Any]]] = None
         
-        self.client = LabellerrClient(
-            api_key=api_key,
-            api_secret=api_secret,
-            enable_connection_pooling=True
-        )
+        self._client_key = (api_key, api_secret)
+        self._closed = False
+        with _CLIENT_LOCK:
+            shared = _CLIENT_CACHE.get(self._client_key)
+            if shared is None:
+                shared = (
+                    LabellerrClient(
+                        api_key=api_key,
+                        api_secret=api_secret,
+                        enable_connection_pooling=True
+                    ),
+                    RateLimiter(rpm=rpm),
+                )
+                _CLIENT_CACHE[self._client_key] = shared
+            elif rpm is not None and rpm != shared[1].rpm:
+                raise ValueError(
+                    f"rpm={rpm} conflicts with rpm={shared[1].rpm} of an open "
+                    f"connector with the same credentials"
+                )
+            self.client, self._limiter = shared
+            _CLIENT_REFCOUNTS[self._client_key] = _CLIENT_REFCOUNTS.get(self._client_key, 0) + 1
         
         logger.info("Labellerr connector initialized")
     
@@ -102,7 +244,9 @@ class LabellerrConnector:
             raise ValueError("Either folder_to_upload or files_to_upload must be provided")
         
         try:
+            self._limiter.acquire()
             result = self.client.initiate_create_project(payload)
+            self.invalidate()
             logger.info(f"Project created successfully: {result.get('project_id')}")
             return result
         except LabellerrError as e:
@@ -131,13 +275,12 @@ class LabellerrConnector:
         if not self.client_id:
             raise ValueError("client_id is required to push annotations")
         
-        annotation_path = Path(annotation_file)
-        if not annotation_path.exists():
-            raise FileNotFoundError(f"Annotation file not found: {annotation_file}")
+        annotation_path = _check_annotation_file(annotation_file)
         
         try:
             if async_mode:
                 logger.info(f"Starting async pre-annotation upload to project {project_id}")
+                self._limiter.acquire()
                 future = self.client.upload_preannotation_by_project_id_async(
                     project_id=project_id,
                     client_id=self.client_id,
@@ -147,6 +290,7 @@ class LabellerrConnector:
                 result = future.result(timeout=600)  # 10 minutes timeout
             else:
                 logger.info(f"Starting sync pre-annotation upload to project {project_id}")
+                self._limiter.acquire()
                 result = self.client.upload_preannotation_by_project_id(
                     project_id=project_id,
                     client_id=self.client_id,
@@ -160,10 +304,183 @@ class LabellerrConnector:
             logger.error(f"Failed to upload pre-annotations: {str(e)}")
             raise
     
+    def push_preannotations_batch(
+        self,
+        project_id: str,
+        annotation_files: List[str],
+        annotation_format: str = "coco_json",
+        batch_size: int = 20,
+        async_mode: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """
+        Push many pre-annotation files with one upload per batch.
+        
+        COCO files are merged ``batch_size`` at a time into a single COCO
+        document (ids are renumbered, categories unified by name), so N files
+        take N / batch_size uploads. Other formats cannot be merged and are
+        uploaded one file per request.
+        
+        Args:
+            project_id: ID of the target project
+            annotation_files: Paths to annotation files
+            annotation_format: Format of annotations ('coco_json', 'json', etc.)
+            batch_size: Number of COCO files merged into each upload
+            async_mode: If True, submit all uploads before waiting on any,
+                so they run concurrently; each may take up to 10 minutes
+            
+        Returns:
+            List with the upload status of every request, in order
+            
+        Raises:
+            TimeoutError: If an async upload takes longer than 10 minutes
+        """
+        if not self.client_id:
+            raise ValueError("client_id is required to push annotations")
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        
+        annotation_paths = [
+            _check_annotation_file(annotation_file) for annotation_file in annotation_files
+        ]
+        
+        with tempfile.TemporaryDirectory(prefix="alo_preannotations_") as tmp_dir:
+            if annotation_format == "coco_json":
+                upload_paths = []
+                for start in range(0, len(annotation_paths), batch_size):
+                    batch = annotation_paths[start:start + batch_size]
+                    if len(batch) == 1:
+                        upload_paths.append(batch[0])
+                        continue
+                    
+                    merged_path = Path(tmp_dir) / f"batch_{start // batch_size}.json"
+                    with open(merged_path, 'w', buffering=_IO_BUFFER_SIZE) as f:
+                        json.dump(_merge_coco(batch), f)
+                    upload_paths.append(merged_path)
+            else:
+                upload_paths = annotation_paths
+            
+            logger.info(
+                f"Uploading {len(annotation_paths)} pre-annotation files to project "
+                f"{project_id} in {len(upload_paths)} requests"
+            )
+            
+            try:
+                if async_mode:
+                    futures = []
+                    for upload_path in upload_paths:
+                        self._limiter.acquire()
+                        futures.append(self.client.upload_preannotation_by_project_id_async(
+                            project_id=project_id,
+                            client_id=self.client_id,
+                            annotation_format=annotation_format,
+                            annotation_file=str(upload_path),
+                        ))
+                    try:
+                        results = [future.result(timeout=_UPLOAD_TIMEOUT) for future in futures]
+                    except FutureTimeoutError:
+                        raise TimeoutError(
+                            f"Pre-annotation upload to project {project_id} did not "
+                            f"finish within {_UPLOAD_TIMEOUT} seconds"
+                        ) from None
+                    finally:
+                        # Drop uploads that have not started and let running ones
+                        # finish before the merged files are removed
+                        for future in futures:
+                            future.cancel()
+                        wait(futures)
+                else:
+                    results = []
+                    for upload_path in upload_paths:
+                        self._limiter.acquire()
+                        results.append(self.client.upload_preannotation_by_project_id(
+                            project_id=project_id,
+                            client_id=self.client_id,
+                            annotation_format=annotation_format,
+                            annotation_file=str(upload_path),
+                        ))
+            except (LabellerrError, TimeoutError) as e:
+                logger.error(f"Failed to upload pre-annotations: {str(e)}")
+                raise
+        
+        logger.info("Pre-annotations uploaded successfully")
+        return results
+    
+    def push_preannotations_many(
+        self,
+        project_id: str,
+        annotation_files: List[str],
+        annotation_format: str = "coco_json",
+        concurrency: int = 32,
+    ) -> List[Any]:
+        """
+        Push several pre-annotation files concurrently.
+        
+        Synchronous wrapper around :meth:`push_preannotations_many_async`.
+        """
+        return asyncio.run(self.push_preannotations_many_async(
+            project_id, annotation_files, annotation_format, concurrency
+        ))
+    
+    async def push_preannotations_many_async(
+        self,
+        project_id: str,
+        annotation_files: List[str],
+        annotation_format: str = "coco_json",
+        concurrency: int = 32,
+    ) -> List[Any]:
+        """
+        Push several pre-annotation files with bounded concurrency.
+        
+        Each file is uploaded through the SDK's async upload, with at most
+        ``concurrency`` uploads in flight, all over this connector's client.
+        
+        Args:
+            project_id: ID of the target project
+            annotation_files: Paths to annotation files
+            annotation_format: Format of annotations ('coco_json', 'json', etc.)
+            concurrency: Maximum number of simultaneous uploads
+            
+        Returns:
+            Per file, in order, either the upload status or the Exception
+            that made the upload fail
+        """
+        if not self.client_id:
+            raise ValueError("client_id is required to push annotations")
+        
+        annotation_paths = [
+            _check_annotation_file(annotation_file) for annotation_file in annotation_files
+        ]
+        
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        
+        async def upload(annotation_path: Path) -> Dict[str, Any]:
+            async with semaphore:
+                await self._limiter.acquire_async()
+                future = self.client.upload_preannotation_by_project_id_async(
+                    project_id=project_id,
+                    client_id=self.client_id,
+                    annotation_format=annotation_format,
+                    annotation_file=str(annotation_path),
+                )
+                return await asyncio.wait_for(asyncio.wrap_future(future), timeout=600)
+        
+        logger.info(f"Uploading {len(annotation_paths)} pre-annotation files to project {project_id}")
+        results = await asyncio.gather(
+            *(upload(annotation_path) for annotation_path in annotation_paths),
+            return_exceptions=True
+        )
+        
+        for annotation_path, result in zip(annotation_paths, results):
+            if isinstance(result, Exception):
+                logger.error(f"Failed to upload pre-annotations from {annotation_path}: {str(result)}")
+        
+        return results
+    
     def pull_annotations(
         self,
         project_id: str,
         export_config: Optional[Dict[str, Any]] = None,
+        output_path: Optional[str] = None,
     ) -> Dict[str, Any]:
         """
         Pull annotations from a Labellerr project.
@@ -171,9 +488,12 @@ class LabellerrConnector:
         Args:
             project_id: ID of the project
             export_config: Export configuration (optional)
+            output_path: If given, write the export as JSON to this file
+                instead of returning it (optional)
             
         Returns:
-            Dictionary with export details
+            Dictionary with export details, or with ``path`` and ``size`` (in
+            bytes) of the written file when ``output_path`` is given
         """
         if not self.client_id:
             raise ValueError("client_id is required to pull annotations")
@@ -188,53 +508,212 @@ class LabellerrConnector:
         
         try:
             logger.info(f"Creating export for project {project_id}")
+            self._limiter.acquire()
             result = self.client.create_local_export(
                 project_id=project_id,
                 client_id=self.client_id,
                 export_config=export_config,
             )
             logger.info("Export created successfully")
-            return result
         except LabellerrError as e:
             logger.error(f"Failed to create export: {str(e)}")
             raise
+        
+        if output_path is None:
+            return result
+        
+        size = self._write_export(result, Path(output_path))
+        logger.info(f"Export for project {project_id} written to {output_path} ({size} bytes)")
+        return {"path": str(output_path), "size": size}
+    
+    def _write_export(self, export: Dict[str, Any], output_path: Path) -> int:
+        """
+        Write an export as JSON and return the file size.
+        
+        The JSON is encoded incrementally through a 1 MiB buffer, so the
+        serialized export is never held in memory as a whole. The file is
+        written under a temporary name and renamed, so readers never see a
+        partial export.
+        """
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=output_path.parent, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', buffering=_IO_BUFFER_SIZE) as f:
+                json.dump(export, f)
+            os.replace(tmp_path, output_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        return os.stat(output_path).st_size
+    
+    async def pull_annotations_async(
+        self,
+        project_id: str,
+        export_config: Optional[Dict[str, Any]] = None,
+        output_path: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Pull annotations from a Labellerr project without blocking the event loop.
+        
+        The SDK has no async export call, so :meth:`pull_annotations` runs in
+        a worker thread.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None, self.pull_annotations, project_id, export_config, output_path
+        )
     
-    def get_all_projects(self) -> List[Dict[str, Any]]:
+    def pull_annotations_many(
+        self,
+        project_ids: List[str],
+        export_config: Optional[Dict[str, Any]] = None,
+        concurrency: int = 16,
+    ) -> List[Any]:
+        """
+        Pull annotations from several projects concurrently.
+        
+        Synchronous wrapper around :meth:`pull_annotations_many_async`.
+        """
+        return asyncio.run(self.pull_annotations_many_async(project_ids, export_config, concurrency))
+    
+    async def pull_annotations_many_async(
+        self,
+        project_ids: List[str],
+        export_config: Optional[Dict[str, Any]] = None,
+        concurrency: int = 16,
+    ) -> List[Any]:
+        """
+        Pull annotations from several projects with bounded concurrency.
+        
+        Args:
+            project_ids: IDs of the projects
+            export_config: Export configuration used for every project (optional)
+            concurrency: Maximum number of simultaneous exports
+            
+        Returns:
+            Per project, in order, either the export details or the Exception
+            that made the export fail
+        """
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        
+        async def pull(project_id: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.pull_annotations_async(project_id, export_config)
+        
+        results: List[Any] = await asyncio.gather(
+            *(pull(project_id) for project_id in project_ids),
+            return_exceptions=True
+        )
+        return results
+    
+    def get_all_projects(self, use_cache: bool = True) -> List[Dict[str, Any]]:
         """
         Get all projects for the client.
         
+        Listings are cached for five minutes, in memory and under the ALO
+        cache directory, keyed by a SHA-256 of the client ID and endpoint.
+        Every call returns its own copy, so callers may modify it.
+        
+        Args:
+            use_cache: If False, always fetch a fresh listing
+            
         Returns:
             List of project dictionaries
         """
+        return copy.deepcopy(self._get_projects(use_cache))
+    
+    def _get_projects(self, use_cache: bool) -> List[Dict[str, Any]]:
+        """The project listing itself, shared with the cache; never modify it."""
         if not self.client_id:
             raise ValueError("client_id is required to get projects")
         
+        cache_key = self._projects_cache_key()
+        if use_cache:
+            cached: Optional[List[Dict[str, Any]]] = _PROJECT_CACHE.get(cache_key)
+            if cached is not None:
+                return cached
+        
         try:
+            self._limiter.acquire()
             result = self.client.get_all_project_per_client_id(self.client_id)
-            projects = result.get("response", [])
+            projects: List[Dict[str, Any]] = result.get("response", [])
             logger.info(f"Retrieved {len(projects)} projects")
-            return projects
         except LabellerrError as e:
             logger.error(f"Failed to retrieve projects: {str(e)}")
             raise
+        
+        _PROJECT_CACHE.set(cache_key, projects)
+        return projects
+    
+    async def get_all_projects_async(self, use_cache: bool = True) -> List[Dict[str, Any]]:
+        """Async variant of :meth:`get_all_projects`, run in a worker thread."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.get_all_projects, use_cache)
     
     def get_project_by_id(self, project_id: str) -> Optional[Dict[str, Any]]:
         """
         Get a specific project by ID.
         
+        The cached listing is used first; if the project is not in it, the
+        listing is fetched again once, since the project may have been
+        created elsewhere after the listing was cached.
+        
         Args:
             project_id: Project ID
             
         Returns:
-            Project dictionary or None if not found
+            Copy of the project dictionary, or None if not found
         """
-        projects = self.get_all_projects()
-        for project in projects:
-            if project.get("project_id") == project_id:
-                return project
+        for use_cache in (True, False):
+            projects = self._get_projects(use_cache)
+            
+            # Rebuild the id index only when the listing itself changed
+            if projects is not self._indexed_projects:
+                self._project_index = {}
+                for project in projects:
+                    key = project.get("project_id")
+                    if key is not None:
+                        self._project_index.setdefault(key, project)
+                self._indexed_projects = projects
+            
+            if project_id in self._project_index:
+                # A copy, so callers cannot change the cached listing
+                return copy.deepcopy(self._project_index[project_id])
+        
         return None
     
+    def invalidate(self) -> None:
+        """Drop the cached project listing so the next lookup fetches it again."""
+        if self.client_id:
+            _PROJECT_CACHE.delete(self._projects_cache_key())
+        self._project_index = {}
+        self._indexed_projects = None
+    
+    def _projects_cache_key(self) -> str:
+        return hashlib.sha256(
+            f"{self.client_id}\0get_all_project_per_client_id".encode('utf-8')
+        ).hexdigest()
+    
     def close(self):
-        """Close the connector and cleanup resources."""
-        self.client.close()
+        """
+        Close the connector and cleanup resources.
+        
+        The underlying client is shared with other connectors using the same
+        credentials and is only closed once the last of them is closed.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        
+        with _CLIENT_LOCK:
+            remaining = _CLIENT_REFCOUNTS.get(self._client_key, 1) - 1
+            if remaining > 0:
+                _CLIENT_REFCOUNTS[self._client_key] = remaining
+            else:
+                _CLIENT_REFCOUNTS.pop(self._client_key, None)
+                shared = _CLIENT_CACHE.get(self._client_key)
+                if shared is not None and shared[0] is self.client:
+                    del _CLIENT_CACHE[self._client_key]
+                self.client.close()
+        
         logger.info("Labellerr connector closed")
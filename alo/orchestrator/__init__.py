@@ -1,5 +1,6 @@
 """Workflow orchestration engine."""
 
 from alo.orchestrator.workflow import WorkflowOrchestrator
+from alo.orchestrator.context import RunContext
 
-__all__ = ["WorkflowOrchestrator"]
+__all__ = ["WorkflowOrchestrator", "RunContext"]
@@ -0,0 +1,56 @@
+"""
+Run context shared by the steps of a workflow run.
+"""
+
+import threading
+from typing import Dict, Any, Optional
+
+
+class RunContext:
+    """
+    Shared, thread-safe store of step results for one workflow run.
+    
+    Agents that accept a ``ctx`` argument receive the run's context and
+    can pull exactly the upstream values they need, instead of receiving
+    every dependency result merged into their inputs.
+    
+    Args:
+        results: Dictionary to store results in (default: a new one)
+        
+    Example:
+        >>> ctx = RunContext()
+        >>> ctx.put("sample_dataset", {"sampled_images": images})
+        >>> ctx.get("sample_dataset", "sampled_images")
+    """
+    
+    def __init__(self, results: Optional[Dict[str, Any]] = None):
+        self.results = results if results is not None else {}
+        self._lock = threading.Lock()
+    
+    def put(self, step: str, result: Any) -> None:
+        """Store the result of a step."""
+        with self._lock:
+            self.results[step] = result
+    
+    def get(self, step: str, key: Optional[str] = None, default: Any = None) -> Any:
+        """
+        Return a step's result, or a single entry of it.
+        
+        Args:
+            step: Name of the step
+            key: Entry of the step's result to return (optional)
+            default: Value returned when the step or entry does not exist
+            
+        Returns:
+            The step result, ``result[key]`` if a key is given, or ``default``
+        """
+        with self._lock:
+            result = self.results.get(step, default)
+        
+        if key is None or result is default:
+            return result
+        return result.get(key, default)
+    
+    def __contains__(self, step: str) -> bool:
+        with self._lock:
+            return step in self.results
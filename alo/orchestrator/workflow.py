@@ -2,18 +2,47 @@
 Workflow Orchestrator - Core engine for managing labeling pipelines.
 """
 
+import copy
+import heapq
+import hashlib
+import asyncio
+import inspect
+import functools
 import logging
 import yaml
+from collections import ChainMap
+from collections.abc import Mapping
+from concurrent.futures import Future, ThreadPoolExecutor, FIRST_COMPLETED, wait
 from pathlib import Path
-from typing import Dict, List, Any, Optional
-from pydantic import BaseModel, Field
+from types import MappingProxyType, ModuleType
+from typing import Callable, Dict, List, Any, Iterator, Optional
+from pydantic import BaseModel, ConfigDict, Field
+from alo.utils.cache import ResultCache
+from alo.orchestrator.context import RunContext
+
+try:
+    # libyaml-backed loader, much faster than the pure-Python one
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+_json_loads: Callable[[bytes], Any]
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
 
 logger = logging.getLogger(__name__)
 
+# Bump when WorkflowConfig changes shape so stale cached configs are ignored
+_CONFIG_CACHE_VERSION = 2
+
 
 class WorkflowStep(BaseModel):
     """Represents a single step in the workflow."""
     
+    model_config = ConfigDict(validate_assignment=False, extra='ignore')
+    
     name: str = Field(..., description="Step name")
     agent: Optional[str] = Field(None, description="Agent to execute")
     action: Optional[str] = Field(None, description="Action to perform")
@@ -24,12 +53,73 @@ class WorkflowStep(BaseModel):
 class WorkflowConfig(BaseModel):
     """Workflow configuration model."""
     
+    model_config = ConfigDict(validate_assignment=False, extra='ignore')
+    
     name: str = Field(..., description="Workflow name")
     description: Optional[str] = Field(None, description="Workflow description")
     steps: List[WorkflowStep] = Field(..., description="Workflow steps")
     parameters: Dict[str, Any] = Field(default_factory=dict, description="Global parameters")
 
 
+class _NamespaceView(Mapping):
+    """
+    Read-only view exposing a step result's keys as ``"<step>.<key>"``.
+    
+    Lets dependent steps see upstream results under prefixed names without
+    copying every entry into a new dict.
+    """
+    
+    def __init__(self, namespace: str, result: Dict[str, Any]):
+        self._prefix = f"{namespace}."
+        self._result = result
+    
+    def __getitem__(self, key: str) -> Any:
+        if isinstance(key, str) and key.startswith(self._prefix):
+            return self._result[key[len(self._prefix):]]
+        raise KeyError(key)
+    
+    def __iter__(self) -> Iterator[str]:
+        return (f"{self._prefix}{key}" for key in self._result)
+    
+    def __len__(self) -> int:
+        return len(self._result)
+
+
+# Workflow agent names → agent class names in alo.agents
+_AGENT_MAP = MappingProxyType({
+    'intelligent_sampler': 'IntelligentSamplerAgent',
+    'smart_sampler': 'IntelligentSamplerAgent',
+    'object_discoverer': 'ObjectDiscoveryAgent',
+    'gpt4v_object_discoverer': 'ObjectDiscoveryAgent',
+    'llm_validator': 'LLMValidatorAgent',
+    'ensemble_validator': 'EnsembleValidatorAgent',
+})
+
+_AGENTS: Optional[ModuleType] = None
+
+
+def _get_agents() -> ModuleType:
+    """Import alo.agents on first use; it pulls in CrewAI and LangChain."""
+    global _AGENTS
+    if _AGENTS is None:
+        from alo import agents
+        _AGENTS = agents
+    return _AGENTS
+
+
+@functools.lru_cache(maxsize=None)
+def _accepts_context(method: Any) -> bool:
+    """Whether an agent's execute method takes the run context as ``ctx``."""
+    try:
+        return 'ctx' in inspect.signature(method).parameters
+    except (TypeError, ValueError):
+        return False
+
+
+# Validated configs keyed by a hash of the file contents
+_CONFIG_CACHE = ResultCache('workflows', maxsize=64)
+
+
 class WorkflowOrchestrator:
     """
     Orchestrates the execution of labeling workflows.
@@ -53,28 +143,120 @@ class WorkflowOrchestrator:
         self.config_path = Path(config_path)
         self.config: Optional[WorkflowConfig] = None
         self.results: Dict[str, Any] = {}
+        self._steps_by_name: Dict[str, WorkflowStep] = {}
+        self._topo_order: List[WorkflowStep] = []
+        self._dependents: Dict[str, List[str]] = {}
+        self._context = RunContext(self.results)
+        self._agent_class_cache: Dict[str, Optional[type]] = {}
+        self._step_count = 0
         
         self._load_config()
     
     def _load_config(self) -> None:
-        """Load and validate workflow configuration."""
+        """
+        Load and validate workflow configuration.
+        
+        Validated configs are cached under a SHA-256 of the file contents,
+        so loading an unchanged file again skips parsing and validation:
+        cached, already-validated data is rebuilt with ``model_construct``.
+        """
         if not self.config_path.exists():
             raise FileNotFoundError(f"Config file not found: {self.config_path}")
         
-        with open(self.config_path, 'r') as f:
-            if self.config_path.suffix in ['.yaml', '.yml']:
-                config_dict = yaml.safe_load(f)
+        data = self.config_path.read_bytes()
+        is_yaml = self.config_path.suffix in ['.yaml', '.yml']
+        digest = hashlib.sha256(data)
+        digest.update(f"\0{is_yaml}\0{_CONFIG_CACHE_VERSION}".encode('utf-8'))
+        cache_key = digest.hexdigest()
+        
+        cached = _CONFIG_CACHE.get(cache_key)
+        if isinstance(cached, dict):
+            # Copy so orchestrators never share mutable step parameters
+            self.config = self._construct_config(copy.deepcopy(cached))
+        else:
+            # Both parsers accept bytes, which skips a separate text-decoding pass
+            if is_yaml:
+                config_dict = yaml.load(data, Loader=_YamlLoader)
             else:
-                import json
-                config_dict = json.load(f)
+                config_dict = _json_loads(data)
+            
+            self.config = WorkflowConfig(**config_dict)
+            _CONFIG_CACHE.set(cache_key, self.config.model_dump())
         
-        self.config = WorkflowConfig(**config_dict)
+        self._step_count = len(self.config.steps)
+        self._build_execution_order(self.config.steps)
         logger.info(f"Loaded workflow: {self.config.name}")
     
+    def _construct_config(self, validated: Dict[str, Any]) -> WorkflowConfig:
+        """Build a WorkflowConfig from previously validated data without re-validating."""
+        steps = [WorkflowStep.model_construct(**step) for step in validated.pop('steps')]
+        return WorkflowConfig.model_construct(steps=steps, **validated)
+    
+    def _build_execution_order(self, steps: List[WorkflowStep]) -> None:
+        """
+        Index steps by name and sort them topologically (Kahn's algorithm).
+        
+        Among steps that are ready at the same time, declaration order is
+        kept, so a workflow whose steps are already in dependency order runs
+        exactly as declared. Dependencies on unknown steps are left for
+        execution time to report.
+        
+        Args:
+            steps: Workflow steps in declaration order
+        
+        Raises:
+            ValueError: If step names are duplicated or dependencies form a cycle
+        """
+        self._steps_by_name = {}
+        for step in steps:
+            if step.name in self._steps_by_name:
+                raise ValueError(f"Duplicate step name: {step.name}")
+            self._steps_by_name[step.name] = step
+        
+        position = {step.name: i for i, step in enumerate(steps)}
+        in_degree = [0] * len(steps)
+        dependents: List[List[int]] = [[] for _ in steps]
+        for i, step in enumerate(steps):
+            for dep in set(step.depends_on):
+                if dep in position:
+                    in_degree[i] += 1
+                    dependents[position[dep]].append(i)
+        
+        ready = [i for i, degree in enumerate(in_degree) if degree == 0]
+        heapq.heapify(ready)
+        order = []
+        while ready:
+            i = heapq.heappop(ready)
+            order.append(steps[i])
+            for j in dependents[i]:
+                in_degree[j] -= 1
+                if in_degree[j] == 0:
+                    heapq.heappush(ready, j)
+        
+        self._dependents = {
+            step.name: [steps[j].name for j in dependents[i]]
+            for i, step in enumerate(steps)
+        }
+        
+        if len(order) < len(steps):
+            cyclic = [step.name for i, step in enumerate(steps) if in_degree[i] > 0]
+            raise ValueError(f"Workflow steps have circular dependencies: {', '.join(cyclic)}")
+        
+        self._topo_order = order
+    
     def run(self, connector: Any, dry_run: bool = False) -> Dict[str, Any]:
         """
         Execute the workflow.
         
+        Steps whose dependencies have all finished run in parallel on a
+        thread pool of ``max_parallel`` workers (workflow parameter,
+        default: 8), so independent branches overlap. After a step fails no
+        new steps are started, and the error is raised once the running
+        steps have finished.
+        
+        Agents whose ``execute`` accepts a ``ctx`` argument are given the
+        run's :class:`RunContext` to read upstream results from.
+        
         Args:
             connector: LabellerrConnector instance for data exchange
             dry_run: If True, validate without executing
@@ -89,21 +271,135 @@ class WorkflowOrchestrator:
         
         if dry_run:
             logger.info("Dry run - validating workflow only")
-            return {"status": "validated", "steps": len(self.config.steps)}
+            return {"status": "validated", "steps": self._step_count}
+        
+        # Results are shared with agents through the run context
+        self._context = RunContext(self.results)
+        
+        max_parallel = self.config.parameters.get('max_parallel', 8)
+        position = {step.name: i for i, step in enumerate(self._topo_order)}
+        in_degree = {step.name: 0 for step in self._topo_order}
+        for dependents in self._dependents.values():
+            for name in dependents:
+                in_degree[name] += 1
+        
+        ready = [step for step in self._topo_order if in_degree[step.name] == 0]
+        running: Dict[Future, WorkflowStep] = {}
+        error: Optional[Exception] = None
+        
+        with ThreadPoolExecutor(max_workers=max_parallel) as executor:
+            while ready or running:
+                # Submit only as many steps as there are idle workers, so none
+                # sit queued in the pool where a failure could not stop them
+                while ready and len(running) < max_parallel:
+                    step = ready.pop(0)
+                    logger.info(f"Executing step: {step.name}")
+                    running[executor.submit(self._execute_step, step, connector)] = step
+                
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in sorted(done, key=lambda f: position[running[f].name]):
+                    step = running.pop(future)
+                    
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        logger.error(f"Step {step.name} failed: {str(e)}")
+                        if error is None:
+                            error = e
+                            # Start nothing new; running steps cannot be interrupted
+                            ready = []
+                        continue
+                    
+                    self._context.put(step.name, result)
+                    logger.info(f"Step {step.name} completed successfully")
+                    
+                    if error is None:
+                        for name in self._dependents[step.name]:
+                            in_degree[name] -= 1
+                            if in_degree[name] == 0:
+                                ready.append(self._steps_by_name[name])
+                
+                ready.sort(key=lambda s: position[s.name])
         
-        for step in self.config.steps:
-            logger.info(f"Executing step: {step.name}")
+        if error is not None:
+            raise error
+        
+        return self.results
+    
+    async def run_async(self, connector: Any, dry_run: bool = False) -> Dict[str, Any]:
+        """
+        Execute the workflow, running independent steps concurrently.
+        
+        Every step starts as soon as the steps it depends on have finished,
+        so e.g. a validator can run while an unrelated discovery step is
+        still waiting on the model. Agents run through their
+        ``execute_async`` method.
+        
+        Args:
+            connector: LabellerrConnector instance for data exchange
+            dry_run: If True, validate without executing
             
-            try:
-                result = self._execute_step(step, connector)
-                self.results[step.name] = result
-                logger.info(f"Step {step.name} completed successfully")
-            except Exception as e:
-                logger.error(f"Step {step.name} failed: {str(e)}")
-                raise
+        Returns:
+            Dictionary with execution results
+        """
+        if not self.config:
+            raise RuntimeError("No configuration loaded")
+        
+        logger.info(f"Starting workflow: {self.config.name}")
+        
+        if dry_run:
+            logger.info("Dry run - validating workflow only")
+            return {"status": "validated", "steps": self._step_count}
+        
+        # Results are shared with agents through the run context
+        self._context = RunContext(self.results)
+        
+        # Reject unknown dependencies before starting anything
+        for step in self._topo_order:
+            for dep in step.depends_on:
+                if dep not in self._steps_by_name:
+                    raise RuntimeError(f"Dependency {dep} not satisfied for step {step.name}")
+        
+        tasks: Dict[str, asyncio.Future] = {}
+        for step in self._topo_order:
+            dependencies = [tasks[dep] for dep in step.depends_on]
+            tasks[step.name] = asyncio.ensure_future(
+                self._execute_step_async(step, connector, dependencies)
+            )
+        
+        try:
+            await asyncio.gather(*tasks.values())
+        except Exception:
+            for task in tasks.values():
+                task.cancel()
+            raise
         
         return self.results
     
+    async def _execute_step_async(
+        self,
+        step: WorkflowStep,
+        connector: Any,
+        dependencies: List[asyncio.Future]
+    ) -> None:
+        """Wait for a step's dependencies, then execute it."""
+        if dependencies:
+            await asyncio.gather(*dependencies)
+        
+        logger.info(f"Executing step: {step.name}")
+        
+        try:
+            if step.agent:
+                result = await self._execute_agent_async(step, connector)
+            else:
+                loop = asyncio.get_running_loop()
+                result = await loop.run_in_executor(None, self._execute_step, step, connector)
+            self._context.put(step.name, result)
+            logger.info(f"Step {step.name} completed successfully")
+        except Exception as e:
+            logger.error(f"Step {step.name} failed: {str(e)}")
+            raise
+    
     def _execute_step(self, step: WorkflowStep, connector: Any) -> Any:
         """Execute a single workflow step."""
         # Check dependencies
@@ -123,31 +419,18 @@ class WorkflowOrchestrator:
         """Execute an agent-based step."""
         logger.info(f"Executing agent: {step.agent}")
         
-        # Import appropriate agent
-        agent_map = {
-            'intelligent_sampler': 'IntelligentSamplerAgent',
-            'smart_sampler': 'IntelligentSamplerAgent',
-            'object_discoverer': 'ObjectDiscoveryAgent',
-            'gpt4v_object_discoverer': 'ObjectDiscoveryAgent',
-            'llm_validator': 'LLMValidatorAgent',
-            'ensemble_validator': 'EnsembleValidatorAgent',
-        }
-        
-        agent_class_name = agent_map.get(step.agent, step.agent)
-        
         try:
-            from alo import agents
-            agent_class = getattr(agents, agent_class_name, None)
+            agent = self._create_agent(step)
             
-            if agent_class:
-                # Initialize agent with step parameters
-                agent = agent_class(**step.parameters)
-                
+            if agent:
                 # Prepare inputs from previous step results
                 inputs = self._prepare_agent_inputs(step, connector)
                 
                 # Execute agent
-                result = agent.execute(inputs)
+                if _accepts_context(type(agent).execute):
+                    result = agent.execute(inputs, ctx=self._context)
+                else:
+                    result = agent.execute(inputs)
                 logger.info(f"Agent {step.agent} completed successfully")
                 return result
             else:
@@ -157,19 +440,64 @@ class WorkflowOrchestrator:
             logger.error(f"Error executing agent {step.agent}: {str(e)}")
             raise
     
-    def _prepare_agent_inputs(self, step: WorkflowStep, connector: Any) -> Dict[str, Any]:
-        """Prepare inputs for agent from previous step results and step parameters."""
-        inputs = dict(step.parameters)
+    async def _execute_agent_async(self, step: WorkflowStep, connector: Any) -> Any:
+        """Execute an agent-based step through the agent's async interface."""
+        logger.info(f"Executing agent: {step.agent}")
         
-        # Add results from dependent steps
-        for dep in step.depends_on:
-            if dep in self.results:
-                dep_result = self.results[dep]
-                # Merge results with a prefix to avoid conflicts
-                for key, value in dep_result.items():
-                    inputs[f"{dep}.{key}"] = value
+        try:
+            agent = self._create_agent(step)
+            
+            if agent:
+                inputs = self._prepare_agent_inputs(step, connector)
+                if _accepts_context(type(agent).execute_async):
+                    result = await agent.execute_async(inputs, ctx=self._context)
+                else:
+                    result = await agent.execute_async(inputs)
+                logger.info(f"Agent {step.agent} completed successfully")
+                return result
+            else:
+                logger.warning(f"Agent {step.agent} not found, returning placeholder")
+                return {"status": "success", "agent": step.agent}
+        except Exception as e:
+            logger.error(f"Error executing agent {step.agent}: {str(e)}")
+            raise
+    
+    def _create_agent(self, step: WorkflowStep) -> Optional[Any]:
+        """Instantiate the agent for a step, or return None if it is unknown."""
+        agent_class = self._get_agent_class(step)
+        
+        if agent_class is None:
+            return None
         
-        return inputs
+        # Initialize agent with step parameters
+        return agent_class(**step.parameters)
+    
+    def _get_agent_class(self, step: WorkflowStep) -> Optional[type]:
+        """Resolve the agent class for a step, or return None if it is unknown."""
+        name = step.agent
+        if name is None:
+            return None
+        if name not in self._agent_class_cache:
+            agent_class_name = _AGENT_MAP.get(name, name)
+            self._agent_class_cache[name] = getattr(_get_agents(), agent_class_name, None)
+        return self._agent_class_cache[name]
+    
+    def _prepare_agent_inputs(self, step: WorkflowStep, connector: Any) -> ChainMap:
+        """
+        Prepare inputs for agent from previous step results and step parameters.
+        
+        Dependency results are layered over the step parameters as
+        ``"<dep>.<key>"`` views instead of being copied. Writes by the agent
+        land in a fresh top layer, so step parameters are never modified.
+        """
+        dep_results = {
+            dep: self._context.get(dep) for dep in step.depends_on if dep in self._context
+        }
+        
+        # Later dependencies take precedence, as when results were merged in order
+        views = [_NamespaceView(dep, result) for dep, result in dep_results.items()]
+        # ChainMap only writes to its first map, so read-only lower layers are safe
+        return ChainMap({}, *reversed(views), step.parameters)  # type: ignore[arg-type]
     
     def _execute_action(self, step: WorkflowStep, connector: Any) -> Any:
         """Execute an action-based step."""
@@ -194,6 +522,20 @@ class WorkflowOrchestrator:
     
     def _pull_from_labellerr(self, step: WorkflowStep, connector: Any) -> Any:
         """Pull annotations from Labellerr."""
+        project_ids = step.parameters.get("project_ids")
+        if isinstance(project_ids, list) and connector is not None:
+            # Export every project concurrently over the connector's shared client
+            logger.info(f"Pulling from {len(project_ids)} Labellerr projects")
+            exports = connector.pull_annotations_many(
+                project_ids,
+                export_config=step.parameters.get("export_config"),
+                concurrency=step.parameters.get("concurrency", 16),
+            )
+            for project_id, export in zip(project_ids, exports):
+                if isinstance(export, Exception):
+                    raise RuntimeError(f"Pull from project {project_id} failed: {str(export)}") from export
+            return {"status": "pulled", "project_ids": project_ids, "exports": exports}
+        
         project_id = step.parameters.get("project_id")
         
         logger.info(f"Pulling from Labellerr project: {project_id}")
@@ -201,5 +543,14 @@ class WorkflowOrchestrator:
         return {"status": "pulled", "project_id": project_id}
     
     def validate(self) -> Dict[str, Any]:
-        """Validate workflow configuration without execution."""
-        return self.run(connector=None, dry_run=True)
+        """
+        Validate workflow configuration without execution.
+        
+        The configuration is fully checked when it is loaded (schema,
+        duplicate step names, dependency cycles), so this only reports it.
+        """
+        if not self.config:
+            raise RuntimeError("No configuration loaded")
+        
+        logger.info(f"Validated workflow: {self.config.name}")
+        return {"status": "validated", "steps": self._step_count, "name": self.config.name}
@@ -1,3 +1,5 @@
 """Utility functions and helpers."""
 
-__all__ = []
+from alo.utils.cache import ResultCache, get_cache_dir
+
+__all__ = ["ResultCache", "get_cache_dir"]
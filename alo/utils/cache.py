@@ -0,0 +1,153 @@
+"""
+Result caching helpers shared across ALO components.
+"""
+
+import os
+import json
+import logging
+import tempfile
+import time
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def get_cache_dir(*parts: str) -> Path:
+    """
+    Return the ALO cache directory, optionally joined with sub-directories.
+    
+    Defaults to ``~/.cache/alo`` and can be overridden with the
+    ``ALO_CACHE_DIR`` environment variable. The directory is not created.
+    """
+    root = os.environ.get('ALO_CACHE_DIR') or Path.home() / '.cache' / 'alo'
+    return Path(root).joinpath(*parts)
+
+
+class ResultCache:
+    """
+    Two-level cache for expensive, deterministic results.
+    
+    Values live in an in-process LRU and, when ``persist`` is enabled, are
+    also written as JSON to one file per key under the ALO cache directory
+    so they survive across processes. Values that do not survive a JSON
+    round trip unchanged are only kept in memory. Keys must be
+    filesystem-safe strings such as hex digests.
+    
+    With a ``ttl``, entries expire that many seconds after they were stored;
+    the age of persisted entries is taken from their file's mtime.
+    
+    Args:
+        namespace: Sub-directory of the cache directory for this cache
+        maxsize: Maximum number of entries kept in memory
+        persist: Whether to store entries on disk
+        ttl: Seconds an entry stays valid (default: forever)
+        
+    Example:
+        >>> cache = ResultCache("discovery")
+        >>> cache.set(digest, ["dog", "person"])
+        >>> cache.get(digest)
+        ['dog', 'person']
+    """
+    
+    def __init__(
+        self,
+        namespace: str,
+        maxsize: int = 4096,
+        persist: bool = True,
+        ttl: Optional[float] = None
+    ):
+        self.namespace = namespace
+        self.maxsize = maxsize
+        self.persist = persist
+        self.ttl = ttl
+        self._memory: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    @property
+    def directory(self) -> Path:
+        """Directory holding the persisted entries."""
+        return get_cache_dir(self.namespace)
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return the cached value for ``key``, or ``default`` on a miss."""
+        with self._lock:
+            if key in self._memory:
+                stored_at, value = self._memory[key]
+                if not self._expired(stored_at):
+                    self._memory.move_to_end(key)
+                    return value
+                del self._memory[key]
+        
+        if not self.persist:
+            return default
+        
+        try:
+            with open(self._path(key), 'rb') as f:
+                stored_at = os.fstat(f.fileno()).st_mtime
+                if self._expired(stored_at):
+                    return default
+                value = json.load(f)
+        except FileNotFoundError:
+            return default
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable cache entry {key}: {str(e)}")
+            return default
+        
+        self._remember(key, value, stored_at)
+        return value
+    
+    def set(self, key: str, value: Any) -> None:
+        """Store ``value`` under ``key``."""
+        self._remember(key, value)
+        
+        if not self.persist:
+            return
+        
+        try:
+            encoded = json.dumps(value)
+            if json.loads(encoded) != value:
+                raise ValueError("value changes in a JSON round trip")
+        except (TypeError, ValueError) as e:
+            logger.debug(f"Not persisting cache entry {key}: {str(e)}")
+            return
+        
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            # Write to a temp file and rename so readers never see partial entries
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(encoded)
+            os.replace(tmp_path, self._path(key))
+        except OSError as e:
+            logger.warning(f"Could not persist cache entry {key}: {str(e)}")
+    
+    def delete(self, key: str) -> None:
+        """Remove ``key`` from memory and disk, if present."""
+        with self._lock:
+            self._memory.pop(key, None)
+        
+        if self.persist:
+            try:
+                os.remove(self._path(key))
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning(f"Could not remove cache entry {key}: {str(e)}")
+    
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+    
+    def _expired(self, stored_at: float) -> bool:
+        return self.ttl is not None and time.time() - stored_at > self.ttl
+    
+    def _remember(self, key: str, value: Any, stored_at: Optional[float] = None) -> None:
+        if stored_at is None:
+            stored_at = time.time()
+        with self._lock:
+            self._memory[key] = (stored_at, value)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.maxsize:
+                self._memory.popitem(last=False)
@@ -57,7 +57,6 @@ setup(
         "crewai-tools>=0.2.0",
         "langchain>=0.1.0",
         "langchain-openai>=0.0.5",
-        "langchain-anthropic>=0.1.0",
     ],
     extras_require={
         "dev": [
@@ -73,12 +72,18 @@ setup(
         "agents": [
             "openai>=1.0.0",
             "anthropic>=0.18.0",
+            "langchain-anthropic>=0.1.0",
             "transformers>=4.30.0",
             "torch>=2.0.0",
             "ultralytics>=8.0.0",
         ],
+        "speedups": [
+            "aiofiles>=23.1.0",
+            "numba>=0.57.0",
+            "orjson>=3.9",
+        ],
         "all": [
-            "labellerr-alo[dev,agents]",
+            "labellerr-alo[dev,agents,speedups]",
         ],
     },
     entry_points={
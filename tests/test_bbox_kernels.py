@@ -0,0 +1,85 @@
+"""
+Tests for the bounding box overlap kernels.
+"""
+
+import subprocess
+import sys
+import textwrap
+
+import numpy as np
+import pytest
+
+from alo.agents import _bbox_kernels
+from alo.agents._bbox_kernels import overlap_counts
+
+
+def _brute_force(boxes):
+    counts = []
+    for i, (x, y, w, h) in enumerate(boxes):
+        count = 0
+        for j, (ox, oy, ow, oh) in enumerate(boxes):
+            if i != j and x <= ox + ow and x + w >= ox and y <= oy + oh and y + h >= oy:
+                count += 1
+        counts.append(count)
+    return counts
+
+
+class TestOverlapCounts:
+    
+    def test_matches_brute_force(self):
+        rng = np.random.default_rng(0)
+        boxes = rng.uniform(0, 100, size=(200, 4))
+        
+        assert overlap_counts(boxes).tolist() == _brute_force(boxes.tolist())
+    
+    def test_touching_boxes_overlap(self):
+        boxes = np.array([[0, 0, 10, 10], [10, 10, 5, 5], [20, 20, 1, 1]])
+        
+        assert overlap_counts(boxes).tolist() == [1, 1, 0]
+    
+    def test_numpy_blocks_match_single_block(self, monkeypatch):
+        rng = np.random.default_rng(1)
+        boxes = rng.uniform(0, 100, size=(300, 4))
+        expected = overlap_counts(boxes)
+        
+        monkeypatch.setattr(_bbox_kernels, '_BLOCK_ELEMENTS', 1000)
+        monkeypatch.setattr(_bbox_kernels, 'NUMBA_MIN_BOXES', 10 ** 9)
+        
+        assert overlap_counts(boxes).tolist() == expected.tolist()
+
+
+@pytest.mark.skipif(not _bbox_kernels.HAS_NUMBA, reason="numba is not installed")
+class TestNumbaKernel:
+    
+    def test_matches_numpy(self):
+        rng = np.random.default_rng(2)
+        boxes = rng.uniform(0, 1000, size=(_bbox_kernels.NUMBA_MIN_BOXES + 500, 4))
+        x1, y1 = boxes[:, 0].copy(), boxes[:, 1].copy()
+        x2, y2 = x1 + boxes[:, 2], y1 + boxes[:, 3]
+        
+        assert _bbox_kernels._numba_available()
+        assert np.array_equal(
+            overlap_counts(boxes), _bbox_kernels._overlap_counts_numpy(x1, y1, x2, y2)
+        )
+    
+    def test_import_from_worker_thread_uses_kernel_and_exits(self):
+        script = textwrap.dedent("""
+            import threading
+            result = {}
+            
+            def load():
+                from alo.agents import _bbox_kernels
+                result['ready'] = _bbox_kernels._numba_available()
+            
+            thread = threading.Thread(target=load)
+            thread.start()
+            thread.join()
+            print(result['ready'])
+        """)
+        
+        completed = subprocess.run(
+            [sys.executable, '-c', script], capture_output=True, text=True, timeout=120
+        )
+        
+        assert completed.returncode == 0, completed.stderr
+        assert completed.stdout.strip() == 'True'
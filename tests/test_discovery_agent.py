@@ -0,0 +1,241 @@
+"""
+Tests for ObjectDiscoveryAgent response parsing.
+"""
+
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from alo.agents.discovery_agent import ObjectDiscoveryAgent
+
+
+@pytest.fixture
+def agent():
+    # Bypass __init__ so no language model or CrewAI agent is created
+    agent = object.__new__(ObjectDiscoveryAgent)
+    agent.config = {'cache_results': False}
+    return agent
+
+
+class TestParseBatchResponse:
+    
+    def test_one_line_per_image(self, agent):
+        text = "person, car\ndog\ntree, building, sky"
+        
+        assert agent._parse_batch_response(text, 3) == [
+            ['person', 'car'],
+            ['dog'],
+            ['tree', 'building', 'sky'],
+        ]
+    
+    def test_strips_enumeration_quotes_and_case(self, agent):
+        text = '1. Person, Car\nImage 2: "dog"\n3) Tree'
+        
+        assert agent._parse_batch_response(text, 3) == [
+            ['person', 'car'],
+            ['dog'],
+            ['tree'],
+        ]
+    
+    def test_ignores_blank_lines(self, agent):
+        text = "\nperson\n\n  \ndog\n"
+        
+        assert agent._parse_batch_response(text, 2) == [['person'], ['dog']]
+    
+    def test_missing_line_raises(self, agent):
+        text = "a1\na3\na4\na5"
+        
+        with pytest.raises(ValueError, match="Expected 5 lines"):
+            agent._parse_batch_response(text, 5)
+    
+    def test_extra_line_raises(self, agent):
+        text = "Here are the objects:\nperson\ndog"
+        
+        with pytest.raises(ValueError, match="got 3"):
+            agent._parse_batch_response(text, 2)
+
+
+class TestLineCountMismatch:
+    
+    def test_mismatched_batch_assigns_no_classes(self, agent, monkeypatch):
+        images = [f"a{i}.jpg" for i in range(1, 6)]
+        
+        async def read_image(image_path):
+            return image_path.encode('utf-8')
+        
+        async def aquick_call(system, user):
+            # The model dropped the line for the second image
+            return "a1\na3\na4\na5"
+        
+        monkeypatch.setattr(agent, '_read_image', read_image)
+        monkeypatch.setattr(agent, 'aquick_call', aquick_call)
+        
+        result = asyncio.run(agent.execute_async({
+            'sampled_images': images,
+            'batch_size': 5,
+            'consolidate_similar': False,
+        }))
+        
+        assert result['discovered_classes'] == []
+        assert result['class_examples'] == {}
+        assert result['total_detections'] == 0
+    
+    def test_matched_batch_assigns_classes_by_position(self, agent, monkeypatch):
+        images = ["a1.jpg", "a2.jpg"]
+        
+        async def read_image(image_path):
+            return image_path.encode('utf-8')
+        
+        async def aquick_call(system, user):
+            return "a1\na2"
+        
+        monkeypatch.setattr(agent, '_read_image', read_image)
+        monkeypatch.setattr(agent, 'aquick_call', aquick_call)
+        
+        result = asyncio.run(agent.execute_async({
+            'sampled_images': images,
+            'batch_size': 2,
+            'consolidate_similar': False,
+            'min_class_frequency': 0,
+        }))
+        
+        assert result['class_examples'] == {'a1': ['a1.jpg'], 'a2': ['a2.jpg']}
+
+
+class TestCacheKey:
+    
+    def test_default_models_of_different_providers_do_not_share_keys(self, agent):
+        agent.config = {'model_provider': 'openai'}
+        openai_key = agent._cache_key(b'image', 5, 'prompt')
+        agent.config = {'model_provider': 'anthropic'}
+        anthropic_key = agent._cache_key(b'image', 5, 'prompt')
+        
+        assert openai_key != anthropic_key
+    
+    def test_explicit_default_model_shares_key(self, agent):
+        agent.config = {'model_provider': 'openai'}
+        implicit_key = agent._cache_key(b'image', 5, 'prompt')
+        agent.config = {'model_provider': 'openai', 'model': 'gpt-4-turbo-preview'}
+        
+        assert agent._cache_key(b'image', 5, 'prompt') == implicit_key
+    
+    def test_size_is_part_of_key(self, agent):
+        agent.config = {'model_provider': 'openai'}
+        
+        assert agent._cache_key(b'image', 5, 'prompt') != agent._cache_key(b'image', 6, 'prompt')
+    
+    def test_cold_run_reads_each_image_once(self, agent, tmp_path, monkeypatch):
+        monkeypatch.setenv('ALO_CACHE_DIR', str(tmp_path / 'cache'))
+        agent.config = {'cache_results': True}
+        images = []
+        for i in range(3):
+            path = tmp_path / f"{i}.jpg"
+            path.write_bytes(bytes([i]) * 100)
+            images.append(str(path))
+        
+        reads = []
+        calls = []
+        read_image = agent._read_image
+        
+        async def counting_read(image_path):
+            reads.append(image_path)
+            return await read_image(image_path)
+        
+        async def aquick_call(system, user):
+            calls.append(user)
+            return "dog\ncat\nbird"
+        
+        monkeypatch.setattr(agent, '_read_image', counting_read)
+        monkeypatch.setattr(agent, 'aquick_call', aquick_call)
+        inputs = {'sampled_images': images, 'consolidate_similar': False, 'min_class_frequency': 0}
+        
+        first = asyncio.run(agent.execute_async(inputs))
+        assert sorted(reads) == images
+        
+        # Everything comes from the cache the second time
+        second = asyncio.run(agent.execute_async(inputs))
+        assert len(calls) == 1
+        assert second['class_examples'] == first['class_examples']
+
+
+class TestConsolidation:
+    
+    def test_examples_follow_consolidated_classes(self, agent, monkeypatch):
+        images = ["1.jpg", "2.jpg", "3.jpg", "4.jpg"]
+        
+        async def read_image(image_path):
+            return image_path.encode('utf-8')
+        
+        async def aquick_call(system, user):
+            if isinstance(user, list):
+                return "sedan\nsuv\nsedan, suv\ntruck, dog"
+            return '{"sedan": "vehicle", "suv": "vehicle", "truck": "vehicle"}'
+        
+        monkeypatch.setattr(agent, '_read_image', read_image)
+        monkeypatch.setattr(agent, 'aquick_call', aquick_call)
+        
+        result = asyncio.run(agent.execute_async({
+            'sampled_images': images,
+            'batch_size': 4,
+            'min_class_frequency': 0,
+        }))
+        
+        assert result['discovered_classes'] == ['vehicle', 'dog']
+        assert result['class_examples'] == {
+            'vehicle': ['1.jpg', '3.jpg', '2.jpg'],
+            'dog': ['4.jpg'],
+        }
+
+
+class _FakeBatchClient:
+    """In-memory stand-in for the parts of AsyncOpenAI used by batch mode."""
+    
+    def __init__(self, api_key=None):
+        self.uploads = []
+        self.files = self
+        self.batches = self
+    
+    async def create(self, file=None, purpose=None, input_file_id=None, **kwargs):
+        if file is not None:
+            name, f = file
+            self.uploads.append([json.loads(line) for line in f.read().splitlines()])
+            return SimpleNamespace(id=str(len(self.uploads) - 1))
+        return SimpleNamespace(id=input_file_id, status='completed', output_file_id=input_file_id)
+    
+    async def content(self, file_id):
+        records = [
+            {
+                'custom_id': request['custom_id'],
+                'response': {
+                    'status_code': 200,
+                    'body': {'choices': [{'message': {'content': request['custom_id']}}]},
+                },
+            }
+            for request in self.uploads[int(file_id)]
+        ]
+        return SimpleNamespace(text='\n'.join(json.dumps(r) for r in records))
+
+
+class TestBatchApi:
+    
+    def test_splits_input_files_at_request_limit(self, agent, monkeypatch):
+        import openai
+        from alo.agents import discovery_agent
+        
+        client = _FakeBatchClient()
+        monkeypatch.setattr(openai, 'AsyncOpenAI', lambda api_key=None: client)
+        monkeypatch.setattr(discovery_agent, '_BATCH_FILE_MAX_REQUESTS', 2)
+        
+        async def read_image(image_path):
+            return image_path.encode('utf-8')
+        
+        monkeypatch.setattr(agent, '_read_image', read_image)
+        monkeypatch.setattr(agent, '_persona_prompt', lambda: 'persona')
+        
+        batches = [[f"{i}.jpg"] for i in range(5)]
+        results = asyncio.run(agent._analyze_with_batch_api(batches, 'prompt', 0))
+        
+        assert [len(upload) for upload in client.uploads] == [2, 2, 1]
+        assert results == [[[f"batch-{i}"]] for i in range(5)]
@@ -0,0 +1,275 @@
+"""
+Tests for LabellerrConnector helpers that do not need the Labellerr API.
+"""
+
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from alo.connectors import labellerr_connector
+from alo.connectors.labellerr_connector import LabellerrConnector, _merge_coco
+
+
+def _write(path, coco):
+    path.write_text(json.dumps(coco))
+    return path
+
+
+class TestMergeCoco:
+    
+    def test_unifies_categories_by_name(self, tmp_path):
+        first = _write(tmp_path / "a.json", {
+            'images': [{'id': 1, 'file_name': 'a.jpg'}],
+            'annotations': [{'id': 1, 'image_id': 1, 'category_id': 5}],
+            'categories': [{'id': 5, 'name': 'dog'}],
+        })
+        second = _write(tmp_path / "b.json", {
+            'images': [{'id': 1, 'file_name': 'b.jpg'}],
+            'annotations': [
+                {'id': 1, 'image_id': 1, 'category_id': 1},
+                {'id': 2, 'image_id': 1, 'category_id': 2},
+            ],
+            'categories': [{'id': 1, 'name': 'cat'}, {'id': 2, 'name': 'dog'}],
+        })
+        
+        merged = _merge_coco([first, second])
+        
+        assert merged['categories'] == [{'id': 1, 'name': 'dog'}, {'id': 2, 'name': 'cat'}]
+        assert [(a['image_id'], a['category_id']) for a in merged['annotations']] == [
+            (1, 1), (2, 2), (2, 1),
+        ]
+        assert [a['id'] for a in merged['annotations']] == [1, 2, 3]
+    
+    def test_unifies_images_by_file_name(self, tmp_path):
+        first = _write(tmp_path / "a.json", {
+            'images': [{'id': 7, 'file_name': 'shared.jpg'}],
+            'annotations': [{'id': 1, 'image_id': 7, 'category_id': 1}],
+            'categories': [{'id': 1, 'name': 'dog'}],
+        })
+        second = _write(tmp_path / "b.json", {
+            'images': [
+                {'id': 1, 'file_name': 'other.jpg'},
+                {'id': 2, 'file_name': 'shared.jpg'},
+            ],
+            'annotations': [
+                {'id': 1, 'image_id': 2, 'category_id': 1},
+                {'id': 2, 'image_id': 1, 'category_id': 1},
+            ],
+            'categories': [{'id': 1, 'name': 'cat'}],
+        })
+        
+        merged = _merge_coco([first, second])
+        
+        assert merged['images'] == [
+            {'id': 1, 'file_name': 'shared.jpg'},
+            {'id': 2, 'file_name': 'other.jpg'},
+        ]
+        assert [(a['image_id'], a['category_id']) for a in merged['annotations']] == [
+            (1, 1), (1, 2), (2, 2),
+        ]
+    
+    def test_drops_dangling_annotations(self, tmp_path):
+        coco = _write(tmp_path / "a.json", {
+            'images': [{'id': 1, 'file_name': 'a.jpg'}],
+            'annotations': [
+                {'id': 1, 'image_id': 1, 'category_id': 1},
+                {'id': 2, 'image_id': 99, 'category_id': 1},
+                {'id': 3, 'image_id': 1, 'category_id': 99},
+                {'id': 4, 'category_id': 1},
+            ],
+            'categories': [{'id': 1, 'name': 'dog'}],
+        })
+        
+        merged = _merge_coco([coco])
+        
+        assert merged['annotations'] == [{'id': 1, 'image_id': 1, 'category_id': 1}]
+    
+    def test_keeps_other_keys_from_first_file(self, tmp_path):
+        first = _write(tmp_path / "a.json", {'info': {'version': 1}, 'images': []})
+        second = _write(tmp_path / "b.json", {'info': {'version': 2}, 'licenses': []})
+        
+        merged = _merge_coco([first, second])
+        
+        assert merged['info'] == {'version': 1}
+        assert merged['licenses'] == []
+        assert merged['images'] == merged['annotations'] == merged['categories'] == []
+
+
+class _FakeClient:
+    """Labellerr client whose project listing can change between calls."""
+    
+    def __init__(self, **kwargs):
+        self.projects = []
+        self.listings = 0
+        self.closed = False
+    
+    def get_all_project_per_client_id(self, client_id):
+        self.listings += 1
+        return {'response': list(self.projects)}
+    
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def connector(tmp_path, monkeypatch):
+    monkeypatch.setenv('ALO_CACHE_DIR', str(tmp_path))
+    monkeypatch.setattr(labellerr_connector, 'LabellerrClient', _FakeClient)
+    connector = LabellerrConnector('key', f'secret-{tmp_path}', client_id='client')
+    yield connector
+    connector.invalidate()
+    connector.close()
+
+
+class TestGetProjectById:
+    
+    def test_uses_cached_listing(self, connector):
+        connector.client.projects = [{'project_id': 'p1'}]
+        
+        assert connector.get_project_by_id('p1') == {'project_id': 'p1'}
+        assert connector.get_project_by_id('p1') == {'project_id': 'p1'}
+        assert connector.client.listings == 1
+    
+    def test_refetches_once_on_miss(self, connector):
+        connector.client.projects = [{'project_id': 'p1'}]
+        connector.get_project_by_id('p1')
+        
+        # Created elsewhere after the listing was cached
+        connector.client.projects.append({'project_id': 'p2'})
+        
+        assert connector.get_project_by_id('p2') == {'project_id': 'p2'}
+        assert connector.client.listings == 2
+    
+    def test_results_do_not_share_the_cached_listing(self, connector):
+        connector.client.projects = [{'project_id': 'p1', 'name': 'one'}]
+        
+        connector.get_all_projects().clear()
+        connector.get_project_by_id('p1')['name'] = 'changed'
+        
+        assert connector.get_all_projects() == [{'project_id': 'p1', 'name': 'one'}]
+        assert connector.get_project_by_id('p1') == {'project_id': 'p1', 'name': 'one'}
+        assert connector.client.listings == 1
+    
+    def test_unknown_project_returns_none(self, connector):
+        connector.client.projects = [{'project_id': 'p1'}]
+        connector.get_project_by_id('p1')
+        
+        assert connector.get_project_by_id('missing') is None
+        assert connector.client.listings == 2
+
+
+class TestSharedClient:
+    
+    def test_same_credentials_share_client_and_limiter(self, connector):
+        other = LabellerrConnector('key', connector.api_secret)
+        try:
+            assert other.client is connector.client
+            assert other._limiter is connector._limiter
+        finally:
+            other.close()
+    
+    def test_other_credentials_get_their_own_client(self, connector):
+        other = LabellerrConnector('other-key', connector.api_secret)
+        try:
+            assert other.client is not connector.client
+        finally:
+            other.close()
+    
+    def test_client_closed_with_last_connector(self, connector):
+        other = LabellerrConnector('key', connector.api_secret)
+        
+        other.close()
+        assert not connector.client.closed
+        
+        # Closing twice must not release the other connector's reference
+        other.close()
+        assert not connector.client.closed
+        
+        connector.close()
+        assert connector.client.closed
+    
+    def test_new_client_after_all_connectors_closed(self, connector):
+        client = connector.client
+        connector.close()
+        
+        other = LabellerrConnector('key', connector.api_secret)
+        try:
+            assert other.client is not client
+        finally:
+            other.close()
+    
+    def test_rpm_is_shared_by_credentials(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(labellerr_connector, 'LabellerrClient', _FakeClient)
+        first = LabellerrConnector('key', f'rpm-{tmp_path}', rpm=60)
+        try:
+            second = LabellerrConnector('key', f'rpm-{tmp_path}')
+            assert second._limiter is first._limiter
+            assert second._limiter.rpm == 60
+            second.close()
+            
+            with pytest.raises(ValueError, match="rpm=120"):
+                LabellerrConnector('key', f'rpm-{tmp_path}', rpm=120)
+        finally:
+            first.close()
+
+
+class _UploadClient(_FakeClient):
+    """Client whose async uploads run on a thread pool, some of them slowly."""
+    
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.executor = ThreadPoolExecutor(max_workers=4)
+        self.delay = 0
+        self.seen = []
+    
+    def upload_preannotation_by_project_id_async(self, annotation_file, **kwargs):
+        return self.executor.submit(self._upload, annotation_file)
+    
+    def _upload(self, annotation_file):
+        time.sleep(self.delay)
+        # The file must still be there when the upload reads it
+        self.seen.append(os.path.exists(annotation_file))
+        return {'status': 'ok', 'file': annotation_file}
+
+
+class TestPushPreannotationsBatch:
+    
+    @pytest.fixture
+    def uploader(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(labellerr_connector, 'LabellerrClient', _UploadClient)
+        connector = LabellerrConnector('key', f'upload-{tmp_path}', client_id='client')
+        yield connector
+        connector.close()
+        connector.client.executor.shutdown()
+    
+    def _files(self, tmp_path, count):
+        return [
+            str(_write(tmp_path / f"{i}.json", {
+                'images': [{'id': 1, 'file_name': f"{i}.jpg"}],
+                'annotations': [],
+                'categories': [],
+            }))
+            for i in range(count)
+        ]
+    
+    def test_async_uploads_merged_batches(self, uploader, tmp_path):
+        results = uploader.push_preannotations_batch(
+            'project', self._files(tmp_path, 5), batch_size=2, async_mode=True
+        )
+        
+        assert len(results) == 3
+        assert uploader.client.seen == [True, True, True]
+    
+    def test_timeout_raises_after_running_uploads_finish(self, uploader, tmp_path, monkeypatch):
+        monkeypatch.setattr(labellerr_connector, '_UPLOAD_TIMEOUT', 0.05)
+        uploader.client.delay = 0.3
+        
+        with pytest.raises(TimeoutError, match="did not finish within"):
+            uploader.push_preannotations_batch(
+                'project', self._files(tmp_path, 4), batch_size=2, async_mode=True
+            )
+        
+        assert uploader.client.seen == [True, True]
@@ -0,0 +1,104 @@
+"""
+Tests for the token-bucket RateLimiter.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from alo.connectors import _ratelimit
+from alo.connectors._ratelimit import RateLimiter
+
+
+class _FakeClock:
+    """Monotonic clock that only advances when told to, recording sleeps."""
+    
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+    
+    def monotonic(self):
+        return self.now
+    
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = _FakeClock()
+    monkeypatch.setattr(_ratelimit, 'time', SimpleNamespace(monotonic=fake.monotonic, sleep=fake.sleep))
+    return fake
+
+
+class TestRateLimiter:
+    
+    def test_rejects_non_positive_rpm(self):
+        with pytest.raises(ValueError):
+            RateLimiter(rpm=0)
+        with pytest.raises(ValueError):
+            RateLimiter(rpm=-5)
+    
+    def test_no_rpm_never_waits(self, clock):
+        limiter = RateLimiter()
+        
+        for _ in range(100):
+            limiter.acquire()
+        
+        assert clock.sleeps == []
+    
+    def test_burst_is_served_without_waiting(self, clock):
+        limiter = RateLimiter(rpm=600, burst=5)
+        
+        for _ in range(5):
+            limiter.acquire()
+        
+        assert clock.sleeps == []
+    
+    def test_callers_past_the_burst_queue_in_order(self, clock):
+        # 600 rpm refills one token every 0.1s
+        limiter = RateLimiter(rpm=600, burst=1)
+        
+        for _ in range(4):
+            limiter.acquire()
+        
+        assert clock.sleeps == pytest.approx([0.1, 0.2, 0.3])
+    
+    def test_tokens_refill_over_time(self, clock):
+        limiter = RateLimiter(rpm=600, burst=2)
+        limiter.acquire()
+        limiter.acquire()
+        
+        clock.now += 0.2
+        limiter.acquire()
+        limiter.acquire()
+        
+        assert clock.sleeps == []
+    
+    def test_refill_is_capped_at_burst(self, clock):
+        limiter = RateLimiter(rpm=600, burst=2)
+        
+        clock.now += 60
+        for _ in range(3):
+            limiter.acquire()
+        
+        assert clock.sleeps == pytest.approx([0.1])
+    
+    def test_async_acquire_waits_on_the_event_loop(self, clock, monkeypatch):
+        sleeps = []
+        
+        async def fake_sleep(seconds):
+            sleeps.append(seconds)
+        
+        monkeypatch.setattr(_ratelimit.asyncio, 'sleep', fake_sleep)
+        limiter = RateLimiter(rpm=60, burst=1)
+        
+        async def acquire_twice():
+            await limiter.acquire_async()
+            await limiter.acquire_async()
+        
+        asyncio.run(acquire_twice())
+        
+        assert sleeps == pytest.approx([1.0])
+        assert clock.sleeps == []
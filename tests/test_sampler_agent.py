@@ -0,0 +1,113 @@
+"""
+Tests for IntelligentSamplerAgent dataset walking and sampling.
+"""
+
+import random
+from collections import Counter
+from pathlib import Path
+
+import pytest
+
+from alo.agents.sampler_agent import (
+    IMAGE_EXTENSIONS,
+    IntelligentSamplerAgent,
+    random_sample_reservoir,
+)
+
+
+@pytest.fixture
+def agent():
+    # Bypass __init__ so no language model or CrewAI agent is created
+    agent = object.__new__(IntelligentSamplerAgent)
+    agent.config = {}
+    return agent
+
+
+@pytest.fixture
+def dataset(tmp_path):
+    # Names chosen so that per-directory sorting differs from naive
+    # lexical sorting of names ("a-b" < "a/" but "a" < "a-b")
+    for name in [
+        "a/1.jpg", "a/sub/2.PNG", "a-b/3.jpeg", "a-b/notes.txt", "b.jpg",
+        "a0.png", "A.webp", "z/y/x/4.bmp", "c.tiff", "skip.gif",
+    ]:
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b"")
+    return tmp_path
+
+
+def _rglob_images(root):
+    """The original sorted rglob listing, with extensions in either case."""
+    images = set()
+    for ext in IMAGE_EXTENSIONS:
+        images.update(root.rglob(f"*{ext}"))
+        images.update(root.rglob(f"*{ext.upper()}"))
+    return sorted(str(p) for p in images)
+
+
+class TestIterImages:
+    
+    def test_sorted_walk_matches_sorted_rglob(self, agent, dataset):
+        assert list(agent._iter_images(str(dataset))) == _rglob_images(dataset)
+    
+    def test_unsorted_walk_finds_same_images(self, agent, dataset):
+        assert sorted(agent._iter_images(str(dataset), sort=False)) == _rglob_images(dataset)
+    
+    def test_accepts_path_objects(self, agent, dataset):
+        assert list(agent._iter_images(Path(dataset))) == _rglob_images(dataset)
+
+
+class TestRandomSampleReservoir:
+    
+    def test_short_stream_returned_whole(self):
+        assert random_sample_reservoir(iter(range(3)), 5) == [0, 1, 2]
+    
+    def test_non_positive_k(self):
+        assert random_sample_reservoir(range(10), 0) == []
+    
+    def test_sample_is_distinct_and_from_stream(self):
+        sample = random_sample_reservoir(iter(range(1000)), 50)
+        
+        assert len(sample) == len(set(sample)) == 50
+        assert all(0 <= item < 1000 for item in sample)
+    
+    def test_roughly_uniform(self):
+        random.seed(1234)
+        counts = Counter()
+        for _ in range(2000):
+            counts.update(random_sample_reservoir(iter(range(20)), 5))
+        
+        # Each item is expected 2000 * 5 / 20 = 500 times
+        assert set(counts) == set(range(20))
+        assert all(400 < count < 600 for count in counts.values())
+
+
+class TestDiverseIndices:
+    
+    def test_evenly_spaced_middles(self, agent):
+        assert list(agent._diverse_indices(100, 10)) == list(range(5, 100, 10))
+    
+    def test_small_dataset_takes_everything(self, agent):
+        assert list(agent._diverse_indices(3, 10)) == [0, 1, 2]
+    
+    def test_exact_count_within_range(self, agent):
+        for total, size in [(101, 10), (7, 3), (1000, 999)]:
+            indices = list(agent._diverse_indices(total, size))
+            assert len(indices) == size
+            assert indices == sorted(set(indices))
+            assert indices[-1] < total
+    
+    def test_execute_picks_match_list_sampling(self, agent, tmp_path):
+        for i in range(40):
+            (tmp_path / f"{i:03d}.jpg").write_bytes(b"")
+        
+        result = agent.execute({
+            'dataset_path': str(tmp_path),
+            'sample_percentage': 0.25,
+            'strategy': 'diverse',
+        })
+        
+        images = _rglob_images(tmp_path)
+        assert result['sampled_images'] == agent._diverse_sampling(images, 10)
+        assert result['sampling_metadata']['total_images'] == 40
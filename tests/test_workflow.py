@@ -0,0 +1,234 @@
+"""
+Tests for WorkflowOrchestrator config loading and step scheduling.
+"""
+
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+import yaml
+
+from alo.orchestrator import workflow
+from alo.orchestrator.workflow import WorkflowOrchestrator, WorkflowStep
+from alo.utils.cache import ResultCache
+
+
+@pytest.fixture
+def agents(monkeypatch):
+    """Route ``agent: recording`` steps to an agent that runs per-step hooks."""
+    recorder = SimpleNamespace(hooks={}, started=[])
+    
+    class RecordingAgent:
+        def __init__(self, name):
+            self.name = name
+        
+        def execute(self, inputs):
+            recorder.started.append(self.name)
+            hook = recorder.hooks.get(self.name)
+            if hook is not None:
+                hook()
+            return {'step': self.name}
+    
+    monkeypatch.setattr(workflow, '_get_agents', lambda: SimpleNamespace(recording=RecordingAgent))
+    return recorder
+
+
+@pytest.fixture
+def config_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv('ALO_CACHE_DIR', str(tmp_path / 'cache'))
+    cache = ResultCache('workflows', maxsize=64)
+    monkeypatch.setattr(workflow, '_CONFIG_CACHE', cache)
+    return cache
+
+
+def _write_workflow(path, steps, **parameters):
+    config = {
+        'name': 'test',
+        'parameters': parameters,
+        'steps': [
+            {
+                'name': name,
+                'agent': 'recording',
+                'parameters': {'name': name},
+                'depends_on': depends_on,
+            }
+            for name, depends_on in steps
+        ],
+    }
+    path.write_text(yaml.safe_dump(config))
+    return path
+
+
+def _orchestrator(tmp_path, steps, **parameters):
+    return WorkflowOrchestrator(str(_write_workflow(tmp_path / 'workflow.yaml', steps, **parameters)))
+
+
+@pytest.mark.usefixtures('config_cache')
+class TestExecutionOrder:
+    
+    def test_dependencies_come_first(self, tmp_path):
+        orchestrator = _orchestrator(tmp_path, [
+            ('report', ['validate']),
+            ('validate', ['discover', 'sample']),
+            ('discover', ['sample']),
+            ('sample', []),
+        ])
+        
+        assert [s.name for s in orchestrator._topo_order] == [
+            'sample', 'discover', 'validate', 'report',
+        ]
+    
+    def test_declaration_order_kept_among_ready_steps(self, tmp_path):
+        orchestrator = _orchestrator(tmp_path, [
+            ('c', []),
+            ('a', []),
+            ('b', ['c']),
+        ])
+        
+        assert [s.name for s in orchestrator._topo_order] == ['c', 'a', 'b']
+    
+    def test_rejects_cycles(self, tmp_path):
+        with pytest.raises(ValueError, match="circular dependencies: a, b"):
+            _orchestrator(tmp_path, [
+                ('a', ['b']),
+                ('b', ['a']),
+                ('c', []),
+            ])
+    
+    def test_rejects_duplicate_names(self, tmp_path):
+        with pytest.raises(ValueError, match="Duplicate step name: a"):
+            _orchestrator(tmp_path, [('a', []), ('a', [])])
+    
+    def test_unknown_dependency_fails_at_run_time(self, tmp_path, agents):
+        orchestrator = _orchestrator(tmp_path, [('a', ['missing'])])
+        
+        with pytest.raises(RuntimeError, match="Dependency missing not satisfied"):
+            orchestrator.run(connector=None)
+
+
+@pytest.mark.usefixtures('config_cache')
+class TestRun:
+    
+    def test_independent_steps_run_in_parallel(self, tmp_path, agents):
+        # Each step waits for the other, so this only passes if both run at once
+        barrier = threading.Barrier(2, timeout=5)
+        agents.hooks['a'] = barrier.wait
+        agents.hooks['b'] = barrier.wait
+        orchestrator = _orchestrator(tmp_path, [('a', []), ('b', []), ('c', ['a', 'b'])])
+        
+        results = orchestrator.run(connector=None)
+        
+        assert set(results) == {'a', 'b', 'c'}
+        assert agents.started[-1] == 'c'
+    
+    def test_max_parallel_limits_workers(self, tmp_path, agents):
+        active = []
+        peak = []
+        lock = threading.Lock()
+        
+        def track():
+            with lock:
+                active.append(1)
+                peak.append(len(active))
+            threading.Event().wait(0.05)
+            with lock:
+                active.pop()
+        
+        for name in 'abcd':
+            agents.hooks[name] = track
+        orchestrator = _orchestrator(tmp_path, [(name, []) for name in 'abcd'], max_parallel=2)
+        
+        orchestrator.run(connector=None)
+        
+        assert max(peak) <= 2
+    
+    def test_failure_stops_new_steps_and_drains_running_ones(self, tmp_path, agents):
+        b_started = threading.Event()
+        a_failed = threading.Event()
+        
+        def fail():
+            b_started.wait(5)
+            a_failed.set()
+            raise RuntimeError("boom")
+        
+        def slow():
+            b_started.set()
+            a_failed.wait(5)
+            # Give the scheduler time to see the failure before b completes
+            time.sleep(0.2)
+        
+        agents.hooks['a'] = fail
+        agents.hooks['b'] = slow
+        orchestrator = _orchestrator(tmp_path, [
+            ('a', []),
+            ('b', []),
+            ('after_b', ['b']),
+        ], max_parallel=2)
+        
+        with pytest.raises(RuntimeError, match="boom"):
+            orchestrator.run(connector=None)
+        
+        # b was already running and finished; its dependent was never started
+        assert sorted(agents.started) == ['a', 'b']
+        assert 'b' in orchestrator.results
+        assert 'after_b' not in orchestrator.results
+    
+    def test_queued_steps_are_dropped_after_a_failure(self, tmp_path, agents):
+        def fail():
+            raise RuntimeError("boom")
+        
+        agents.hooks['a'] = fail
+        orchestrator = _orchestrator(tmp_path, [('a', []), ('b', []), ('c', [])], max_parallel=1)
+        
+        with pytest.raises(RuntimeError, match="boom"):
+            orchestrator.run(connector=None)
+        
+        assert agents.started == ['a']
+
+
+class TestConfigCache:
+    
+    def test_reload_rebuilds_cached_config_without_validation(self, tmp_path, config_cache, monkeypatch):
+        path = _write_workflow(tmp_path / 'workflow.yaml', [('a', []), ('b', ['a'])])
+        first = WorkflowOrchestrator(str(path))
+        
+        def fail(*args, **kwargs):
+            raise AssertionError("cached config was parsed again")
+        
+        monkeypatch.setattr(workflow.yaml, 'load', fail)
+        second = WorkflowOrchestrator(str(path))
+        
+        assert second.config == first.config
+        assert all(isinstance(step, WorkflowStep) for step in second.config.steps)
+        assert [s.name for s in second._topo_order] == ['a', 'b']
+    
+    def test_cached_configs_do_not_share_parameters(self, tmp_path, config_cache):
+        path = _write_workflow(tmp_path / 'workflow.yaml', [('a', [])])
+        WorkflowOrchestrator(str(path))
+        
+        first = WorkflowOrchestrator(str(path))
+        first.config.steps[0].parameters['name'] = 'changed'
+        second = WorkflowOrchestrator(str(path))
+        
+        assert second.config.steps[0].parameters == {'name': 'a'}
+    
+    def test_changed_file_is_parsed_again(self, tmp_path, config_cache):
+        path = _write_workflow(tmp_path / 'workflow.yaml', [('a', [])])
+        WorkflowOrchestrator(str(path))
+        
+        _write_workflow(path, [('a', []), ('b', [])])
+        orchestrator = WorkflowOrchestrator(str(path))
+        
+        assert [s.name for s in orchestrator.config.steps] == ['a', 'b']
+    
+    def test_persisted_config_survives_a_new_process(self, tmp_path, config_cache, monkeypatch):
+        path = _write_workflow(tmp_path / 'workflow.yaml', [('a', [])])
+        first = WorkflowOrchestrator(str(path))
+        
+        # A fresh in-memory cache stands in for another process
+        monkeypatch.setattr(workflow, '_CONFIG_CACHE', ResultCache('workflows', maxsize=64))
+        monkeypatch.setattr(workflow.yaml, 'load', None)
+        second = WorkflowOrchestrator(str(path))
+        
+        assert second.config == first.config